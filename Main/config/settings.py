@@ -45,6 +45,14 @@ SAMPLE_RATE = 44100
 CHANNELS = 1
 AUDIO_FORMAT = "S16_LE"
 
+# UI feedback sounds
+# Leave empty to play UI sounds through Mopidy (default)
+# Or specify an ALSA device like "default" or "plughw:0,0" to play them
+# directly through pyalsaaudio (lower latency, pip install pyalsaaudio)
+UI_SOUND_DEVICE = ""
+UI_SOUND_PERIOD_SIZE = 128  # Frames per ALSA period (small = low start latency)
+UI_SOUND_PERIODS = 4        # Periods per buffer (128 x 4 = ~12ms at 44.1kHz)
+
 # HTTP Server settings (local API server)
 SERVER_HOST = "localhost"
 SERVER_PORT = 8080
@@ -70,4 +78,5 @@ MIN_DISK_SPACE_MB = 100  # Minimum free disk space in MB before allowing recordi
 PTT_ENABLED = True                          # Enable/disable PTT feature
 PTT_LISTEN_DURATION = 5.0                   # Seconds to listen for voice command
 PTT_WAKE_PHRASE = "hi speaker"              # Must say this before command
+PTT_TEMP_DIR = "/dev/shm"                   # tmpfs for temporary WAVs (keeps them off the SD card)
 # Note: Uses Google Speech API (requires internet connection)
@@ -175,6 +175,28 @@ def action_start_recording(device_state: DeviceState, audio_player, recorder, ui
     return device_state
 
 
+def action_recording_start_failed(device_state: DeviceState, audio_player, ui) -> DeviceState:
+    """arecord died right after starting - return to the state before recording"""
+    log_action("Recording failed to start")
+    
+    previous = device_state.previous_state
+    if previous == State.PLAYING:
+        log_action("Resuming music after failed recording start")
+        audio_player.resume()
+        device_state.state = State.PLAYING
+    elif previous == State.PAUSED:
+        device_state.state = State.PAUSED
+    else:
+        device_state.state = State.IDLE_CHIP_LOADED
+    
+    device_state.was_playing_before_recording = False
+    device_state.previous_state = None
+    
+    ui.on_error()
+    log_state(f"→ {device_state.state}")
+    return device_state
+
+
 def _add_recording_to_library_via_http(filepath: str, display_name: str) -> bool:
     """Add a recording to the library via HTTP POST to local server"""
     import json
@@ -209,8 +231,11 @@ def action_save_recording(device_state: DeviceState, recorder, ui) -> DeviceStat
     # Verify file was actually saved
     if saved_path:
         import os
-        if os.path.exists(saved_path):
-            size = os.path.getsize(saved_path)
+        try:
+            size = os.stat(saved_path).st_size  # One stat for existence and size
+        except OSError:
+            size = None
+        if size is not None:
             log_action(f"Recording file verified: {saved_path} ({size} bytes)")
             
             # Add recording to library automatically via HTTP
@@ -53,7 +53,9 @@ class Controller:
         self._chip_store = ChipStore()
         self._buttons = Buttons()
         self._audio = AudioPlayer()
-        self._recorder = Recorder()
+        # Set from the recorder's timer thread, handled by the main loop
+        self._recording_start_failed = False
+        self._recorder = Recorder(on_start_failed=self._on_recording_start_failed)
         self._ui = UIController()
         
         # Track record button arming (need to hold 3s then release)
@@ -121,7 +123,8 @@ class Controller:
                 # Check if playback finished naturally
                 self._check_playback_finished()
                 
-                # Check if recording exceeded max duration
+                # Check if arecord died right after starting, or exceeded max duration
+                self._check_recording_started()
                 self._check_recording_time_limit()
                 
                 # Periodically check volume limit (every 2 seconds)
@@ -174,18 +177,22 @@ class Controller:
             return
         
         log_event(f"[DEBUG] Scanning directory: {RECORDINGS_DIR}")
-        all_files = os.listdir(RECORDINGS_DIR)
+        # scandir: file type comes with the listing, one stat per recording
+        # gives both mtime and size
+        with os.scandir(RECORDINGS_DIR) as it:
+            all_files = list(it)
         log_event(f"[DEBUG] Found {len(all_files)} files in directory")
         
         recording_files = []
-        for filename in all_files:
+        for entry in all_files:
+            filename = entry.name
             log_event(f"[DEBUG] Checking file: {filename}")
             if filename.endswith('.wav') and filename.startswith('recording_'):
-                filepath = os.path.join(RECORDINGS_DIR, filename)
-                if os.path.isfile(filepath):
-                    mtime = os.path.getmtime(filepath)
-                    size = os.path.getsize(filepath)
-                    recording_files.append((filepath, mtime))
+                if entry.is_file():
+                    st = entry.stat()
+                    mtime = st.st_mtime
+                    size = st.st_size
+                    recording_files.append((entry.path, mtime))
                     log_event(f"[DEBUG] Found recording: {filename} (size: {size} bytes, mtime: {mtime})")
         
         log_event(f"[DEBUG] Total recording files found: {len(recording_files)}")
@@ -531,6 +538,24 @@ class Controller:
             log_error(f"[RECORDING] Error checking disk space: {e}")
             return True  # Allow recording on error (fail open)
     
+    def _on_recording_start_failed(self):
+        """Recorder callback (timer thread) - just flag it for the main loop"""
+        self._recording_start_failed = True
+    
+    def _check_recording_started(self):
+        """Revert to the pre-recording state if arecord crashed on start."""
+        if not self._recording_start_failed:
+            return
+        
+        self._recording_start_failed = False
+        if self.device_state.state != State.RECORDING:
+            return
+        
+        self._recording_start_time = None
+        self.device_state = actions.action_recording_start_failed(
+            self.device_state, self._audio, self._ui
+        )
+    
     def _check_recording_time_limit(self):
         """Check if recording has exceeded max duration and auto-stop if needed."""
         if self.device_state.state != State.RECORDING:
@@ -0,0 +1,206 @@
+"""
+Direct ALSA playback for short UI sounds (optional, via pyalsaaudio)
+
+Keeps PCM handles open between sounds instead of going through Mopidy,
+so a beep is just a write to an already-configured device.
+Enable by setting UI_SOUND_DEVICE in config/settings.py.
+"""
+
+import struct
+import threading
+from typing import Optional, Tuple
+
+from config.settings import UI_SOUND_PERIOD_SIZE, UI_SOUND_PERIODS
+from utils.logger import log_audio, log_error
+
+try:
+    import alsaaudio
+except ImportError:
+    alsaaudio = None
+
+
+# WAV format tags
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def _alsa_format(format_tag: int, bits: int):
+    """Map a WAV (format tag, bits per sample) pair to an ALSA sample format"""
+    if format_tag == WAVE_FORMAT_PCM:
+        return {
+            8: alsaaudio.PCM_FORMAT_U8,
+            16: alsaaudio.PCM_FORMAT_S16_LE,
+            24: alsaaudio.PCM_FORMAT_S24_3LE,
+            32: alsaaudio.PCM_FORMAT_S32_LE,
+        }.get(bits)
+    if format_tag == WAVE_FORMAT_IEEE_FLOAT and bits == 32:
+        return alsaaudio.PCM_FORMAT_FLOAT_LE
+    return None
+
+
+def read_wav(filepath: str) -> Tuple[Tuple[int, int, int, int], bytes]:
+    """Read a WAV file.
+    
+    Handles PCM, float and WAVE_FORMAT_EXTENSIBLE files (the stdlib wave
+    module only reads integer PCM).
+    
+    Returns:
+        ((format_tag, channels, rate, bits), frame bytes)
+    """
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    
+    if data[0:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise ValueError(f"Not a WAV file: {filepath}")
+    
+    fmt = None
+    frames = None
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        size = struct.unpack_from('<I', data, pos + 4)[0]
+        body = pos + 8
+        if chunk_id == b'fmt ':
+            format_tag, channels, rate, _, _, bits = struct.unpack_from('<HHIIHH', data, body)
+            if format_tag == WAVE_FORMAT_EXTENSIBLE:
+                # Real format tag is the first 2 bytes of the SubFormat GUID
+                format_tag = struct.unpack_from('<H', data, body + 24)[0]
+            fmt = (format_tag, channels, rate, bits)
+        elif chunk_id == b'data':
+            frames = data[body:body + size]
+        pos = body + size + (size & 1)  # Chunks are word-aligned
+    
+    if fmt is None or frames is None:
+        raise ValueError(f"Missing fmt/data chunk: {filepath}")
+    return fmt, frames
+
+
+class AlsaPlayer:
+    """Plays WAV files on an ALSA device through persistent PCM handles"""
+    
+    def __init__(self, device: str = "default", period_size: int = UI_SOUND_PERIOD_SIZE,
+                 periods: int = UI_SOUND_PERIODS):
+        """Initialize ALSA player
+        
+        Args:
+            device: ALSA device name (e.g. "default", "plughw:0,0")
+            period_size: Frames per period
+            periods: Periods per ring buffer - a small buffer lets short
+                     beeps start almost immediately instead of after
+                     ALSA's default (often 100ms+) buffer fills
+        """
+        if alsaaudio is None:
+            raise ImportError("pyalsaaudio is required for direct UI sounds. Install with: pip install pyalsaaudio")
+        
+        self._device = device
+        self._period_size = period_size
+        self._periods = periods
+        self._pcms = {}  # (format, channels, rate) -> open alsaaudio.PCM
+        self._decoded = {}  # filepath -> (fmt, frame bytes)
+        self._lock = threading.Lock()
+        # Bumped by interrupt(); a sound stops once the generation it was
+        # started for is no longer current
+        self._generation = 0
+        self._generation_lock = threading.Lock()
+        log_audio(f"ALSA player initialized (device: {device}, period: {period_size} x {periods})")
+    
+    def _get_pcm(self, fmt: Tuple[int, int, int, int]):
+        """Get (or open once) a PCM handle configured for this format"""
+        format_tag, channels, rate, bits = fmt
+        alsa_fmt = _alsa_format(format_tag, bits)
+        if alsa_fmt is None:
+            raise ValueError(f"Unsupported WAV format: tag={format_tag}, bits={bits}")
+        
+        key = (alsa_fmt, channels, rate)
+        pcm = self._pcms.get(key)
+        if pcm is None:
+            pcm = alsaaudio.PCM(
+                type=alsaaudio.PCM_PLAYBACK,
+                mode=alsaaudio.PCM_NORMAL,
+                device=self._device,
+                format=alsa_fmt,
+                channels=channels,
+                rate=rate,
+                periodsize=self._period_size,
+                periods=self._periods,
+            )
+            self._pcms[key] = pcm
+        return pcm
+    
+    def preload(self, filepaths) -> int:
+        """Decode WAV files into memory once so playback does no disk IO.
+        
+        Returns:
+            Number of files decoded
+        """
+        for filepath in filepaths:
+            try:
+                self._decoded[filepath] = read_wav(filepath)
+            except Exception as e:
+                log_error(f"Cannot preload sound {filepath}: {e}")
+        return len(self._decoded)
+    
+    def play_file(self, filepath: str, generation: Optional[int] = None):
+        """
+        Play a WAV file (blocks until the sound has been written or interrupted)
+        
+        Args:
+            filepath: WAV file to play
+            generation: Value interrupt() returned when the sound was queued -
+                the sound is skipped/cut short once a later interrupt() happens.
+                None = the current generation.
+        """
+        if generation is None:
+            generation = self._generation
+        elif generation != self._generation:
+            return  # Superseded while it was waiting in the queue
+        decoded = self._decoded.get(filepath)
+        fmt, frames = decoded if decoded else read_wav(filepath)
+        _, channels, _, bits = fmt
+        chunk = self._period_size * channels * (bits // 8)
+        with self._lock:
+            pcm = self._get_pcm(fmt)
+            try:
+                # Write a period at a time so an interrupt takes effect within one period
+                for start in range(0, len(frames), chunk):
+                    if self._generation != generation:
+                        pcm.drop()  # Discard queued samples - device is ready again at once
+                        return
+                    pcm.write(frames[start:start + chunk])
+            except Exception:
+                # Reopen the handle on next use rather than reuse one in a bad state
+                self._discard_pcm(pcm)
+                raise
+    
+    def interrupt(self) -> int:
+        """
+        Cut short the sound currently being played (if any), and any sound
+        queued before this call.
+        
+        Returns:
+            The new generation, to pass to play_file() for a sound queued now
+        """
+        with self._generation_lock:
+            self._generation += 1
+            return self._generation
+    
+    def _discard_pcm(self, pcm):
+        """Forget and close a PCM handle"""
+        for key, open_pcm in list(self._pcms.items()):
+            if open_pcm is pcm:
+                del self._pcms[key]
+        try:
+            pcm.close()
+        except Exception:
+            pass
+    
+    def close(self):
+        """Close all open PCM handles"""
+        with self._lock:
+            for pcm in self._pcms.values():
+                try:
+                    pcm.close()
+                except Exception as e:
+                    log_error(f"Error closing ALSA PCM: {e}")
+            self._pcms.clear()
@@ -107,13 +107,19 @@ class AudioPlayer:
         log_audio(f"▶️  Playing URI: {uri}")
         self._current_uri = uri
         
-        # Clear current tracklist and add new track
-        self._execute(self._client.clear)
-        self._execute(self._client.add, uri)
-        self._execute(self._client.play)
+        # Clear current tracklist, add new track and play in one round trip
+        self._execute(self._clear_add_play, uri)
         self._cached_state = "play"  # Update cache
         log_success(f"Playback started: {uri}")
     
+    def _clear_add_play(self, uri: str):
+        """Send clear/add/play as a single MPD command list"""
+        self._client.command_list_ok_begin()
+        self._client.clear()
+        self._client.add(uri)
+        self._client.play()
+        return self._client.command_list_end()
+    
     def pause(self):
         """Pause current playback"""
         log_audio("⏸️  Pausing playback")
@@ -86,13 +86,13 @@ class Buttons:
         else:
             log_error("Buttons not available - hardware libraries missing")
     
-    def _read_raw(self) -> int:
-        """Read raw byte from PCF8574"""
+    def _read_raw(self, now: float) -> int:
+        """Read raw byte from PCF8574 (now: time of this poll, for health tracking)"""
         if self._bus is None:
             return 0xFF  # All buttons released (active-low)
         try:
             result = self._bus.read_byte(PCF8574_ADDRESS)
-            self._health.report_success()
+            self._health.report_success(now)
             return result
         except Exception as e:
             # Track errors silently (no logging to avoid flooding)
@@ -102,8 +102,8 @@ class Buttons:
     
     def update(self):
         """Update button states - call this every loop iteration"""
-        raw = self._read_raw()
         current_time = time.time()
+        raw = self._read_raw(current_time)
         
         for button, bit in self.BUTTON_BITS.items():
             state = self._states[button]
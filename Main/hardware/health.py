@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from typing import List
 
 
-from utils.logger import log, log_success, log_error
+from utils.logger import log, log_success, log_error, flush as flush_log
 
 
 @dataclass
@@ -90,6 +90,7 @@ class HealthChecker:
             self.check_mopidy(),
         ]
         
+        flush_log()  # Print the table after the check log lines
         print("\n" + "=" * 50)
         print("HEALTH CHECK RESULTS")
         print("=" * 50)
@@ -9,6 +9,7 @@ Light 3 (Divided LED):   Speaker LED - controlled by ui/lights.py
     - P6 on 0x20 = Red
 """
 
+import itertools
 from smbus2 import SMBus
 from utils.logger import log
 
@@ -21,6 +22,30 @@ BUTTON_EXPANDER_ADDRESS = 0x20  # Button expander (has divided LED red pin)
 LIGHT1_PINS = (0, 1, 2)  # P0=B, P1=G, P2=R (Health LED)
 LIGHT2_PINS = (3, 4, 5)  # P3=B, P4=G, P5=R (PTT LED)
 # Light 3 is divided: P6=B, P7=G on 0x21, P6=R on 0x20
+LIGHT3_PINS = (6, 7, None)            # P6=B, P7=G on 0x21
+LIGHT3_BUTTON_PINS = (None, None, 6)  # P6=R on 0x20
+
+
+def _pin_bits(pins, color=(True, True, True)) -> int:
+    """Bit mask of the pins that are on for color (None = pin not on this expander)"""
+    return sum(1 << pin for pin, on in zip(pins, color) if on and pin is not None)
+
+
+def _build_patterns(led_pins, button_pins=(None, None, None)) -> dict:
+    """Precompute (led_mask, led_bits, button_mask, button_bits) for every BGR color"""
+    return {
+        color: (_pin_bits(led_pins), _pin_bits(led_pins, color),
+                _pin_bits(button_pins), _pin_bits(button_pins, color))
+        for color in itertools.product((False, True), repeat=3)
+    }
+
+
+# light -> {BGR color: register masks}, so set_light does no per-pin work
+_PATTERNS = {
+    1: _build_patterns(LIGHT1_PINS),
+    2: _build_patterns(LIGHT2_PINS),
+    3: _build_patterns(LIGHT3_PINS, LIGHT3_BUTTON_PINS),
+}
 
 
 class Colors:
@@ -78,45 +103,17 @@ class RGBLeds:
         if not self._enabled:
             return
         
-        if light_num == 3:
-            # Divided LED: B=P6(0x21), G=P7(0x21), R=P6(0x20)
-            b, g, r = color
-            
-            # Blue and Green on LED expander (0x21)
-            if b:
-                self._led_state |= (1 << 6)
-            else:
-                self._led_state &= ~(1 << 6)
-            if g:
-                self._led_state |= (1 << 7)
-            else:
-                self._led_state &= ~(1 << 7)
-            
-            # Red on Button expander (0x20) - P6
-            if r:
-                self._button_state |= (1 << 6)
-            else:
-                self._button_state &= ~(1 << 6)
-            
-            try:
-                self._bus.write_byte(LED_EXPANDER_ADDRESS, self._led_state)
+        led_mask, led_bits, button_mask, button_bits = _PATTERNS.get(light_num, _PATTERNS[2])[color]
+        self._led_state = (self._led_state & ~led_mask) | led_bits
+        self._button_state = (self._button_state & ~button_mask) | button_bits
+        
+        try:
+            self._bus.write_byte(LED_EXPANDER_ADDRESS, self._led_state)
+            if button_mask:
+                # Divided LED: red is on the Button expander (0x20)
                 self._bus.write_byte(BUTTON_EXPANDER_ADDRESS, self._button_state)
-            except Exception as e:
-                log(f"[LEDS] Write error (light 3): {e}")
-        else:
-            # Light 1 or 2 - all pins on LED expander (0x21)
-            pins = LIGHT1_PINS if light_num == 1 else LIGHT2_PINS
-            
-            for pin, on in zip(pins, color):
-                if on:
-                    self._led_state |= (1 << pin)
-                else:
-                    self._led_state &= ~(1 << pin)
-            
-            try:
-                self._bus.write_byte(LED_EXPANDER_ADDRESS, self._led_state)
-            except Exception as e:
-                log(f"[LEDS] Write error: {e}")
+        except Exception as e:
+            log(f"[LEDS] Write error (light {light_num}): {e}")
     
     def off(self, light_num: int):
         """Turn off specific LED"""
@@ -4,22 +4,46 @@ Start/stop/cancel recordings (arecord)
 
 import subprocess
 import os
-import time
-from typing import Optional
+import re
+import shutil
+import threading
+from typing import Callable, Optional
 from datetime import datetime
 from config.paths import RECORDINGS_DIR
 from config.settings import SAMPLE_RATE, CHANNELS, AUDIO_FORMAT, RECORDING_DEVICE
 from utils.logger import log_recording, log_error, log_success
 
+# arecord always prints a "Recording WAVE ..." banner; only these mean trouble
+_STDERR_ERROR_MARKERS = re.compile(rb"error|Permission|No such", re.IGNORECASE)
+
+
+def _read_stderr(process: subprocess.Popen) -> bytes:
+    """Read what the process has written to stderr so far, without blocking"""
+    if not process.stderr:
+        return b""
+    try:
+        return os.read(process.stderr.fileno(), 4096)
+    except (BlockingIOError, OSError):
+        return b""
+
 
 class Recorder:
     """Audio recorder using arecord"""
     
-    def __init__(self):
-        """Initialize recorder"""
+    def __init__(self, on_start_failed: Optional[Callable[[], None]] = None):
+        """
+        Initialize recorder
+        
+        Args:
+            on_start_failed: Called (from a timer thread) when arecord exits
+                right after start() reported success
+        """
+        self._on_start_failed = on_start_failed
         self._process: Optional[subprocess.Popen] = None
         self._current_file: Optional[str] = None
         self._recording = False
+        # Guards _process / _recording / _current_file across threads
+        self._lock = threading.RLock()
         
         # Ensure recordings directory exists
         os.makedirs(RECORDINGS_DIR, exist_ok=True)
@@ -27,141 +51,159 @@ class Recorder:
     
     def start(self, chip_name: str = "unknown") -> bool:
         """Start recording to file. Returns True if recording started successfully."""
-        if self._recording:
-            log_error("Already recording!")
-            return False
-        
-        # Generate filename with timestamp and chip name
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_name = "".join(c for c in chip_name if c.isalnum() or c in "._-")
-        filename = f"recording_{safe_name}_{timestamp}.wav"
-        self._current_file = os.path.join(RECORDINGS_DIR, filename)
-        
-        log_recording(f"🎙️  Starting recording: {filename}")
-        
-        # Check if arecord is available
-        try:
-            subprocess.run(["which", "arecord"], check=True, capture_output=True)
-        except (FileNotFoundError, subprocess.CalledProcessError):
-            log_error("arecord command not found in PATH")
-            log_error("On Raspberry Pi, install with: sudo apt-get install alsa-utils")
-            return False
-        
-        try:
-            # Build arecord command - match working RecordShortAudio.sh format
-            # The working script uses: arecord -f cd -d DURATION FILENAME
-            # We'll use similar format but without -d (we'll stop manually)
-            arecord_cmd = ["arecord", "-f", "cd", self._current_file]
+        with self._lock:
+            if self._recording:
+                log_error("Already recording!")
+                return False
             
-            # Only add -D device if specified and not empty
-            if RECORDING_DEVICE and RECORDING_DEVICE.strip():
-                arecord_cmd.insert(1, "-D")
-                arecord_cmd.insert(2, RECORDING_DEVICE)
-                log_recording(f"Starting arecord with device: {RECORDING_DEVICE}")
-            else:
-                log_recording("Starting arecord with default device")
+            # Generate filename with timestamp and chip name
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            safe_name = "".join(c for c in chip_name if c.isalnum() or c in "._-")
+            filename = f"recording_{safe_name}_{timestamp}.wav"
+            self._current_file = os.path.join(RECORDINGS_DIR, filename)
             
-            self._process = subprocess.Popen(
-                arecord_cmd,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.PIPE
-            )
+            log_recording(f"🎙️  Starting recording: {filename}")
             
-            # Check if process started successfully
-            time.sleep(0.1)  # Brief wait to check if process crashed immediately
-            if self._process.poll() is not None:
-                # Process exited immediately - likely an error
-                stderr_output = self._process.stderr.read().decode() if self._process.stderr else "Unknown error"
-                log_error(f"arecord process exited immediately: {stderr_output}")
-                log_error(f"Check recording device: {RECORDING_DEVICE}")
-                log_error("List available devices with: arecord -l")
-                self._process = None
+            # Check if arecord is available
+            arecord_path = shutil.which("arecord")
+            if arecord_path is None:
+                log_error("arecord command not found in PATH")
+                log_error("On Raspberry Pi, install with: sudo apt-get install alsa-utils")
                 return False
             
-            self._recording = True
-            log_success(f"Recording started: {self._current_file}")
-            return True
-        except FileNotFoundError:
-            log_error("arecord executable not found")
-            log_error("On Raspberry Pi, install with: sudo apt-get install alsa-utils")
-            return False
-        except Exception as e:
-            log_error(f"Failed to start recording: {e}")
-            self._current_file = None
+            try:
+                # Build arecord command - match working RecordShortAudio.sh format
+                # The working script uses: arecord -f cd -d DURATION FILENAME
+                # We'll use similar format but without -d (we'll stop manually)
+                # argv[0] is the absolute path so Popen can use posix_spawn (no fork)
+                arecord_cmd = [arecord_path, "-f", "cd", self._current_file]
+                
+                # Only add -D device if specified and not empty
+                if RECORDING_DEVICE and RECORDING_DEVICE.strip():
+                    arecord_cmd.insert(1, "-D")
+                    arecord_cmd.insert(2, RECORDING_DEVICE)
+                    log_recording(f"Starting arecord with device: {RECORDING_DEVICE}")
+                else:
+                    log_recording("Starting arecord with default device")
+                
+                self._process = subprocess.Popen(
+                    arecord_cmd,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    close_fds=False  # Our fds are non-inheritable anyway (PEP 446)
+                )
+                os.set_blocking(self._process.stderr.fileno(), False)
+                
+                # Check shortly afterwards (off the caller's thread) that it
+                # didn't crash - a late failure is reported via on_start_failed
+                threading.Timer(0.1, self._check_started, args=(self._process,)).start()
+                
+                self._recording = True
+                log_success(f"Recording started: {self._current_file}")
+                return True
+            except FileNotFoundError:
+                log_error("arecord executable not found")
+                log_error("On Raspberry Pi, install with: sudo apt-get install alsa-utils")
+                return False
+            except Exception as e:
+                log_error(f"Failed to start recording: {e}")
+                self._current_file = None
+                self._recording = False
+                return False
+    
+    def _check_started(self, process: subprocess.Popen):
+        """Detect an arecord process that exited right after starting"""
+        with self._lock:
+            if process is not self._process or process.poll() is None:
+                return  # Still running, or already stopped/canceled
+            
+            # Process exited immediately - likely an error
+            stderr_output = _read_stderr(process)
+            log_error(f"arecord process exited immediately: {stderr_output.decode(errors='replace') or 'Unknown error'}")
+            log_error(f"Check recording device: {RECORDING_DEVICE}")
+            log_error("List available devices with: arecord -l")
+            self._process = None
             self._recording = False
-            return False
+            self._current_file = None
+        
+        if self._on_start_failed is not None:
+            self._on_start_failed()
     
     def stop(self) -> Optional[str]:
         """Stop recording and return file path"""
-        if not self._recording:
-            log_error("Not currently recording!")
-            return None
-        
-        log_recording("⏹️  Stopping recording")
-        
-        if self._process:
-            # Send SIGTERM to arecord to stop recording gracefully
-            self._process.terminate()
-            try:
-                self._process.wait(timeout=2)
-            except subprocess.TimeoutExpired:
-                log_error("arecord did not stop gracefully, killing process")
-                self._process.kill()
-                self._process.wait()
+        with self._lock:
+            if not self._recording:
+                log_error("Not currently recording!")
+                return None
             
-            # Check for errors
-            if self._process.stderr:
-                stderr_output = self._process.stderr.read().decode()
-                if stderr_output:
-                    log_error(f"arecord stderr: {stderr_output}")
+            log_recording("⏹️  Stopping recording")
             
-            self._process = None
-        
-        self._recording = False
-        saved_file = self._current_file
-        self._current_file = None
-        
-        if saved_file:
-            if os.path.exists(saved_file):
-                size = os.path.getsize(saved_file)
-                if size > 0:
-                    log_success(f"Recording saved: {saved_file} ({size} bytes)")
+            if self._process:
+                # Send SIGTERM to arecord to stop recording gracefully
+                self._process.terminate()
+                try:
+                    self._process.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    log_error("arecord did not stop gracefully, killing process")
+                    self._process.kill()
+                    self._process.wait()
+                
+                # Check for errors (arecord's normal banner is not worth decoding)
+                stderr_output = _read_stderr(self._process)
+                if _STDERR_ERROR_MARKERS.search(stderr_output):
+                    log_error(f"arecord stderr: {stderr_output.decode(errors='replace')}")
+                
+                self._process = None
+            
+            self._recording = False
+            saved_file = self._current_file
+            self._current_file = None
+            
+            if saved_file:
+                try:
+                    size = os.stat(saved_file).st_size  # One stat for existence and size
+                except OSError:
+                    size = None
+                if size is not None:
+                    if size > 0:
+                        log_success(f"Recording saved: {saved_file} ({size} bytes)")
+                    else:
+                        log_error(f"Recording file is empty: {saved_file}")
                 else:
-                    log_error(f"Recording file is empty: {saved_file}")
+                    log_error(f"Recording file not found: {saved_file}")
+                    log_error("Check if arecord has write permissions to recordings directory")
             else:
-                log_error(f"Recording file not found: {saved_file}")
-                log_error("Check if arecord has write permissions to recordings directory")
-        else:
-            log_error("No file path saved - recording may not have started properly")
-        
-        return saved_file
+                log_error("No file path saved - recording may not have started properly")
+            
+            return saved_file
     
     def cancel(self):
         """Cancel recording (delete file)"""
-        if not self._recording:
-            return
-        
-        log_recording("❌ Canceling recording")
-        
-        if self._process:
-            self._process.terminate()
-            try:
-                self._process.wait(timeout=2)
-            except subprocess.TimeoutExpired:
-                self._process.kill()
-            self._process = None
-        
-        # Delete the file
-        if self._current_file and os.path.exists(self._current_file):
-            try:
-                os.remove(self._current_file)
-                log_recording(f"Deleted canceled recording: {self._current_file}")
-            except Exception as e:
-                log_error(f"Failed to delete recording: {e}")
-        
-        self._recording = False
-        self._current_file = None
-        log_success("Recording canceled")
+        with self._lock:
+            if not self._recording:
+                return
+            
+            log_recording("❌ Canceling recording")
+            
+            if self._process:
+                self._process.terminate()
+                try:
+                    self._process.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    self._process.kill()
+                self._process = None
+            
+            # Delete the file
+            if self._current_file and os.path.exists(self._current_file):
+                try:
+                    os.remove(self._current_file)
+                    log_recording(f"Deleted canceled recording: {self._current_file}")
+                except Exception as e:
+                    log_error(f"Failed to delete recording: {e}")
+            
+            self._recording = False
+            self._current_file = None
+            log_success("Recording canceled")
     
     def is_recording(self) -> bool:
         """Check if currently recording"""
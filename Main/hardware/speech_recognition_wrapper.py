@@ -6,10 +6,15 @@ Requires internet connection.
 
 import os
 import tempfile
+import threading
 import wave
-from typing import Optional
+from typing import List, Optional, Union
+from config.settings import PTT_TEMP_DIR
 from utils.logger import log
 
+# Temporary WAVs go to tmpfs when there is one (default temp dir otherwise)
+TEMP_AUDIO_DIR = PTT_TEMP_DIR if os.path.isdir(PTT_TEMP_DIR) else None
+
 
 class SpeechRecognitionWrapper:
     """
@@ -24,8 +29,17 @@ class SpeechRecognitionWrapper:
     def __init__(self):
         """Initialize speech recognition wrapper."""
         self._recognizer = None
+        self._recognizer_lock = threading.Lock()
         log("[SPEECH] Google Speech Recognition wrapper initialized")
     
+    def preload(self):
+        """
+        Load the recognizer on a background thread, so the first voice
+        command doesn't wait for the speech_recognition import.
+        """
+        threading.Thread(target=self._ensure_recognizer,
+                         name="speech-preload", daemon=True).start()
+    
     def _ensure_recognizer(self) -> bool:
         """
         Lazy load recognizer on first use.
@@ -36,29 +50,36 @@ class SpeechRecognitionWrapper:
         if self._recognizer is not None:
             return True
         
-        try:
-            import speech_recognition as sr
-            self._recognizer = sr.Recognizer()
-            log("[SPEECH] Recognizer ready")
-            return True
-        except ImportError:
-            log("[SPEECH] Error: SpeechRecognition not installed")
-            log("[SPEECH] Install with: pip install SpeechRecognition")
-            return False
-        except Exception as e:
-            log(f"[SPEECH] Error initializing: {e}")
-            return False
+        with self._recognizer_lock:  # preload() may be loading it right now
+            if self._recognizer is not None:
+                return True
+            try:
+                import speech_recognition as sr
+                self._recognizer = sr.Recognizer()
+                log("[SPEECH] Recognizer ready")
+                return True
+            except ImportError:
+                log("[SPEECH] Error: SpeechRecognition not installed")
+                log("[SPEECH] Install with: pip install SpeechRecognition")
+                return False
+            except Exception as e:
+                log(f"[SPEECH] Error initializing: {e}")
+                return False
     
-    def transcribe(self, audio_data: bytes, sample_rate: int = 16000) -> Optional[str]:
+    def transcribe(self, audio_data: bytes, sample_rate: int = 16000,
+                   alternatives: bool = False) -> Optional[Union[str, List[str]]]:
         """
         Transcribe audio bytes to text using Google Speech API.
         
         Args:
             audio_data: Raw PCM audio bytes (16-bit signed, mono)
             sample_rate: Audio sample rate
+            alternatives: Return every candidate transcript, not just the best
             
         Returns:
-            Transcribed text (lowercase) or None on error
+            Transcribed text (lowercase) or None on error.
+            With alternatives=True, a list of transcripts (best first,
+            empty if nothing was understood) or None on error.
         """
         if not self._ensure_recognizer():
             return None
@@ -67,7 +88,7 @@ class SpeechRecognitionWrapper:
             import speech_recognition as sr
             
             # Create a temporary WAV file from raw audio data
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as f:
+            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False, dir=TEMP_AUDIO_DIR) as f:
                 temp_path = f.name
             
             try:
@@ -83,6 +104,18 @@ class SpeechRecognitionWrapper:
                     audio = self._recognizer.record(source)
                 
                 # Transcribe using Google (free, no API key needed)
+                if alternatives:
+                    # Full response - every candidate transcript, best first
+                    response = self._recognizer.recognize_google(audio, show_all=True)
+                    texts = [alt['transcript'].lower().strip()
+                             for alt in (response or {}).get('alternative', [])
+                             if alt.get('transcript')]
+                    if texts:
+                        log(f"[SPEECH] Transcribed: '{texts[0]}' ({len(texts)} candidates)")
+                    else:
+                        log("[SPEECH] Could not understand audio")
+                    return texts
+                
                 text = self._recognizer.recognize_google(audio).lower().strip()
                 
                 if text:
@@ -22,17 +22,35 @@ import tempfile
 import os
 import time
 import signal
-from typing import Optional
+from typing import Optional, Union
 
 from config.settings import (
     PTT_ENABLED,
     PTT_LISTEN_DURATION,
+    PTT_TEMP_DIR,
     PTT_WAKE_PHRASE,
     RECORDING_DEVICE,
 )
 from hardware.speech_recognition_wrapper import SpeechRecognitionWrapper
 from utils.logger import log
 
+try:
+    import alsaaudio  # Optional: in-process capture (pip install pyalsaaudio)
+except ImportError:
+    alsaaudio = None
+
+# Temporary WAVs go to tmpfs when there is one (default temp dir otherwise)
+TEMP_AUDIO_DIR = PTT_TEMP_DIR if os.path.isdir(PTT_TEMP_DIR) else None
+
+# Small, matched ALSA period/buffer for capture (32ms / 128ms at 16kHz) -
+# the last period arrives sooner after the speaker stops
+CAPTURE_PERIOD_FRAMES = 512
+CAPTURE_BUFFER_FRAMES = 2048
+ARECORD_LATENCY_ARGS = [
+    f'--period-size={CAPTURE_PERIOD_FRAMES}',
+    f'--buffer-size={CAPTURE_BUFFER_FRAMES}',
+]
+
 
 # Easter egg configuration (hardcoded)
 EASTER_EGG_CONFIG = {
@@ -53,6 +71,34 @@ EASTER_EGG_CONFIG = {
     },
 }
 
+# Accepted wake phrases: "hi speaker" / "hey speaker" preferred,
+# but "hi" / "hey" alone also work
+WAKE_PHRASES = ("hi speaker", "hey speaker", "hi", "hey")
+
+# Trie node markers (never equal to a word)
+_WAKE_END = object()  # A wake phrase ends at this node
+_COMMAND_END = object()  # Value: the command that ends at this node
+
+
+def _build_command_trie(wake_phrases, commands) -> dict:
+    """
+    Build a word trie of wake phrase + command, e.g.
+    {'hi': {'speaker': {'play': {_COMMAND_END: 'play'}, ...}, ...}}.
+    Commands may be several words ("volume up").
+    """
+    trie = {}
+    for phrase in wake_phrases:
+        node = trie
+        for word in phrase.split():
+            node = node.setdefault(word, {})
+        node[_WAKE_END] = True
+        for command in commands:
+            cmd_node = node
+            for word in command.split():
+                cmd_node = cmd_node.setdefault(word, {})
+            cmd_node[_COMMAND_END] = command
+    return trie
+
 
 class VoiceCommand:
     """
@@ -68,6 +114,9 @@ class VoiceCommand:
     # Supported commands after wake phrase
     COMMANDS = {"play", "pause", "stop", "clear"}
     
+    # Wake phrase + command trie, built once
+    _COMMAND_TRIE = _build_command_trie(WAKE_PHRASES, COMMANDS)
+    
     # Easter egg command identifiers (returned when easter egg detected)
     EASTER_COMMANDS = {
         "easter_shut_up",
@@ -84,6 +133,8 @@ class VoiceCommand:
         self._wake_phrase = PTT_WAKE_PHRASE.lower()
         
         self._speech = SpeechRecognitionWrapper()
+        if self._enabled:
+            self._speech.preload()  # Off the critical path of the first command
         
         # Easter egg configuration (hardcoded)
         self._easter_config = EASTER_EGG_CONFIG
@@ -93,6 +144,10 @@ class VoiceCommand:
         self._recording_file = None
         self._recording_start_time = None
         
+        # In-process capture buffer, allocated on first ALSA capture and
+        # reused across listen_and_parse() calls
+        self._cap_buf = None
+        
         log(f"[VOICE] Initialized (wake phrase: '{self._wake_phrase}')")
         if self._easter_config.get('enabled'):
             log(f"[VOICE] Easter egg commands enabled")
@@ -114,7 +169,7 @@ class VoiceCommand:
             return False
         
         # Create temp file for recording
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as f:
+        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False, dir=TEMP_AUDIO_DIR) as f:
             self._recording_file = f.name
         
         try:
@@ -124,6 +179,7 @@ class VoiceCommand:
                 '-f', 'S16_LE',
                 '-r', '16000',
                 '-c', '1',
+                *ARECORD_LATENCY_ARGS,
                 '-q',
                 self._recording_file
             ]
@@ -201,23 +257,8 @@ class VoiceCommand:
         finally:
             self._cleanup_recording()
         
-        # Transcribe
-        log("[VOICE] Transcribing via Google Speech API...")
-        text = self._speech.transcribe(audio_data, sample_rate=16000)
-        
-        if text is None:
-            log("[VOICE] Transcription failed")
-            return None
-        
-        # Parse command
-        command = self._parse_command(text)
-        
-        if command:
-            log(f"[VOICE] Command recognized: {command}")
-        else:
-            log(f"[VOICE] No valid command in: '{text}'")
-        
-        return command
+        # Transcribe and parse
+        return self._transcribe_and_parse(audio_data)
     
     def is_recording(self) -> bool:
         """Check if currently recording."""
@@ -273,37 +314,60 @@ class VoiceCommand:
             log("[VOICE] Recording failed")
             return None
         
-        # Step 2: Transcribe (uses Google Speech API - needs internet)
+        # Step 2: Transcribe (uses Google Speech API - needs internet) and parse
+        return self._transcribe_and_parse(audio_data)
+    
+    def _transcribe_and_parse(self, audio_data: bytes) -> Optional[str]:
+        """
+        Transcribe audio and parse it for a command.
+        
+        Google returns several candidate transcripts; the best one that is
+        a known command wins, so a near-miss top guess ("hi speaker plays")
+        can still match through a lower-ranked one ("hi speaker play").
+        
+        Args:
+            audio_data: Raw PCM audio bytes (16-bit signed, mono, 16kHz)
+            
+        Returns:
+            Command string or None
+        """
         log("[VOICE] Transcribing via Google Speech API...")
-        text = self._speech.transcribe(audio_data, sample_rate=16000)
+        texts = self._speech.transcribe(audio_data, sample_rate=16000, alternatives=True)
         
-        if text is None:
+        if texts is None:
             log("[VOICE] Transcription failed")
             return None
         
-        # Step 3: Parse command
-        command = self._parse_command(text)
-        
-        if command:
-            log(f"[VOICE] Command recognized: {command}")
-        else:
-            log(f"[VOICE] No valid command in: '{text}'")
+        for i, text in enumerate(texts):
+            # Only the top candidate's mismatch is worth logging
+            command = self._parse_command(text, verbose=(i == 0))
+            if command:
+                if i == 0:
+                    log(f"[VOICE] Command recognized: {command}")
+                else:
+                    log(f"[VOICE] Command recognized: {command} (from candidate '{text}')")
+                return command
         
-        return command
+        log(f"[VOICE] No valid command in: '{texts[0] if texts else ''}'")
+        return None
     
-    def _record_audio(self, duration: float) -> Optional[bytes]:
+    def _record_audio(self, duration: float) -> Optional[Union[bytes, memoryview]]:
         """
-        Record audio using arecord.
+        Record audio - in-process through pyalsaaudio when it is installed,
+        otherwise with arecord.
         
         Args:
             duration: Recording duration in seconds
             
         Returns:
-            Raw PCM audio bytes (16-bit signed, mono, 16kHz) or None
+            Raw PCM audio (16-bit signed, mono, 16kHz) - bytes, or a view
+            into the reused capture buffer - or None
         """
-        # Create temp file for recording
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as f:
-            temp_path = f.name
+        if alsaaudio is not None:
+            try:
+                return self._capture_alsa(duration)
+            except Exception as e:
+                log(f"[VOICE] ALSA capture failed ({e}), falling back to arecord")
         
         try:
             # Build arecord command
@@ -311,14 +375,17 @@ class VoiceCommand:
             # -r 16000: 16kHz sample rate (good for speech)
             # -c 1: mono
             # -d N: duration in seconds
+            # -t raw: headerless PCM to stdout - read straight from the pipe,
+            #         no WAV file written to (and read back from) the SD card
             cmd = [
                 'arecord',
                 '-f', 'S16_LE',
                 '-r', '16000',
                 '-c', '1',
                 '-d', str(int(duration)),
+                '-t', 'raw',
+                *ARECORD_LATENCY_ARGS,
                 '-q',  # quiet mode
-                temp_path
             ]
             
             # Add device if specified
@@ -329,24 +396,21 @@ class VoiceCommand:
             # Run arecord
             result = subprocess.run(
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=False,  # stderr is decoded only on failure
                 timeout=duration + 5  # Extra time for overhead
             )
             
             if result.returncode != 0:
-                stderr = result.stderr.decode() if result.stderr else "Unknown error"
+                stderr = result.stderr.decode('utf-8', 'replace') if result.stderr else "Unknown error"
                 log(f"[VOICE] arecord failed: {stderr}")
                 return None
             
-            # Read raw PCM data (skip WAV header - 44 bytes)
-            with open(temp_path, 'rb') as f:
-                wav_data = f.read()
-                # WAV header is 44 bytes, rest is PCM data
-                if len(wav_data) > 44:
-                    return wav_data[44:]
-                else:
-                    log("[VOICE] Recording too short")
-                    return None
+            if not result.stdout:
+                log("[VOICE] Recording too short")
+                return None
+            return result.stdout
                     
         except subprocess.TimeoutExpired:
             log("[VOICE] Recording timed out")
@@ -357,20 +421,57 @@ class VoiceCommand:
         except Exception as e:
             log(f"[VOICE] Recording error: {e}")
             return None
+    
+    def _capture_alsa(self, duration: float) -> Optional[memoryview]:
+        """
+        Record with pyalsaaudio, reading a period at a time - no arecord
+        process to start, and no pipe between it and us.
+        
+        Args:
+            duration: Recording duration in seconds
+            
+        Returns:
+            Raw PCM audio (16-bit signed, mono, 16kHz) as a view into the
+            reused capture buffer - only valid until the next capture - or None
+        """
+        needed = int(duration * 16000) * 2
+        deadline = time.monotonic() + duration + 5  # Same allowance as arecord
+        pcm = alsaaudio.PCM(
+            type=alsaaudio.PCM_CAPTURE,
+            mode=alsaaudio.PCM_NORMAL,
+            device=RECORDING_DEVICE.strip() or 'default',
+            format=alsaaudio.PCM_FORMAT_S16_LE,
+            channels=1,
+            rate=16000,
+            periodsize=CAPTURE_PERIOD_FRAMES,
+        )
+        if self._cap_buf is None or len(self._cap_buf) < needed:
+            self._cap_buf = bytearray(needed)
+        view = memoryview(self._cap_buf)
+        received = 0
+        try:
+            while received < needed:
+                if time.monotonic() > deadline:
+                    log("[VOICE] Recording timed out")
+                    return None
+                length, data = pcm.read()
+                if length > 0:  # Negative length = overrun, nothing returned
+                    take = min(len(data), needed - received)
+                    view[received:received + take] = data[:take]
+                    received += take
         finally:
-            # Clean up temp file
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
+            pcm.close()
+        
+        return view[:needed]  # No copy - transcribe() takes any bytes-like object
     
-    def _parse_command(self, text: str) -> Optional[str]:
+    def _parse_command(self, text: str, verbose: bool = True) -> Optional[str]:
         """
         Parse transcribed text for wake phrase and command.
         Also checks for easter egg commands (which don't require wake phrase).
         
         Args:
             text: Transcribed text (already lowercase)
+            verbose: Log why the text did not match
             
         Returns:
             Command string or None if not recognized.
@@ -386,27 +487,30 @@ class VoiceCommand:
         if easter_cmd:
             return easter_cmd
         
-        # Accept variations of wake phrase (ordered by priority - longer matches first)
-        # "hi speaker" / "hey speaker" preferred, but "hi" / "hey" alone also work
-        wake_phrases = ["hi speaker", "hey speaker", "hi ", "hey "]
-        
-        remainder = None
-        for phrase in wake_phrases:
-            if text.startswith(phrase):
-                remainder = text[len(phrase):].strip()
+        # Walk the trie word by word; the longest wake phrase and the
+        # longest command along the path win, later words are ignored
+        words = text.split()
+        node = self._COMMAND_TRIE
+        wake_end = None
+        command = None
+        for i, word in enumerate(words):
+            node = node.get(word)
+            if node is None:
                 break
+            if _WAKE_END in node:
+                wake_end = i + 1
+            if _COMMAND_END in node:
+                command = node[_COMMAND_END]
+        
+        if command or not verbose:
+            return command
         
-        if remainder is None:
+        if wake_end is None:
             log(f"[VOICE] No wake phrase found")
             return None
         
-        # Check for each command
-        for cmd in self.COMMANDS:
-            if remainder.startswith(cmd):
-                return cmd
-        
         # Wake phrase present but no valid command
-        log(f"[VOICE] Wake phrase found but unknown command: '{remainder}'")
+        log(f"[VOICE] Wake phrase found but unknown command: '{' '.join(words[wake_end:])}'")
         return None
     
     def _check_easter_egg(self, text: str) -> Optional[str]:
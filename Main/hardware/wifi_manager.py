@@ -5,8 +5,14 @@ This module provides a unified WiFiManager class for WiFi operations
 used by both the main server and the wifi_provisioner service.
 """
 
+import functools
+import html
+import json
+import re
 import subprocess
 import time
+from collections import namedtuple
+from operator import attrgetter
 
 
 # Shared constant for AP mode SSID
@@ -14,6 +20,66 @@ AP_SSID = "SmartSpeaker-Setup"
 AP_IP = "192.168.4.1"
 WEB_PORT = 8080
 
+# Scan results are reused for this long - a rescan takes seconds and
+# blocks whoever asked (e.g. every captive portal page load)
+SCAN_TTL = 30
+_scan_cache = {"ts": float('-inf'), "nets": []}
+
+# Set once the hotspot connection profile is known to exist, so restarting
+# AP mode skips the nmcli probe
+_ap_profile_exists = False
+
+# Output of commands where only the exit status matters goes straight
+# to /dev/null instead of through pipes Python has to drain
+_DEVNULL = subprocess.DEVNULL
+
+_WLAN_OPERSTATE = '/sys/class/net/wlan0/operstate'
+
+# Scan rows are parsed into tuples; dicts are only built for the callers
+_SCAN_FIELDS = 'SSID,SIGNAL,SECURITY,IN-USE'
+_ScanRow = namedtuple('_ScanRow', 'ssid signal security in_use')
+_by_signal = attrgetter('signal')
+_NMCLI_ESCAPE = re.compile(r'\\(.)')
+
+
+def _wifi_list(fields: str) -> str:
+    """Rescan and return terse 'nmcli device wifi list' output.
+    
+    With --rescan yes nmcli waits for NetworkManager to report the scan
+    finished (its LastScan changing), so this takes as long as the scan
+    really does instead of a fixed sleep. If NM refuses to scan (e.g.
+    while the radio is busy as the AP) the last results are listed instead.
+    """
+    cmd = ['nmcli', '-t', '-f', fields, 'device', 'wifi', 'list', '--rescan']
+    result = subprocess.run(cmd + ['yes'], capture_output=True, text=True)
+    if result.returncode != 0:
+        result = subprocess.run(cmd + ['no'], capture_output=True, text=True)
+    return result.stdout
+
+
+def _parse_wifi_list(output: str) -> list[_ScanRow]:
+    """Parse terse _SCAN_FIELDS output into unique SSIDs, strongest first.
+    
+    Terse output escapes ':' in SSIDs as '\\:', so fields are split from
+    the right - only the SSID can contain a colon.
+    """
+    rows = []
+    seen = set()
+    for line in output.splitlines():
+        parts = line.rsplit(':', 3)
+        if len(parts) != 4:
+            continue
+        ssid, signal, security, in_use = parts
+        if '\\' in ssid:
+            ssid = _NMCLI_ESCAPE.sub(r'\1', ssid)
+        # Skip hidden networks (empty / NUL-padded SSID) and duplicate BSSIDs
+        if not ssid or ssid[0] == '\x00' or ssid in seen:
+            continue
+        seen.add(ssid)
+        rows.append(_ScanRow(ssid, int(signal) if signal.isdigit() else 0, security, in_use == '*'))
+    rows.sort(key=_by_signal, reverse=True)
+    return rows
+
 
 class WiFiManager:
     """NetworkManager-based WiFi management"""
@@ -21,10 +87,44 @@ class WiFiManager:
     @staticmethod
     def is_connected() -> bool:
         """Check if connected to WiFi (not AP mode)"""
+        # wlan0 isn't 'up' until it associates, so the common not-yet-connected
+        # case is answered from sysfs without forking iwgetid. 'up' is also
+        # true in AP mode, so only then ask iwgetid which SSID it is.
+        try:
+            with open(_WLAN_OPERSTATE) as f:
+                if f.read().strip() != 'up':
+                    return False
+        except OSError:
+            pass  # No sysfs entry (e.g. renamed interface) - let iwgetid decide
         result = subprocess.run(['iwgetid', '-r'], capture_output=True, text=True)
         ssid = result.stdout.strip()
         return bool(ssid) and ssid != AP_SSID
     
+    @staticmethod
+    def wait_for_connection(timeout: int) -> bool:
+        """Wait up to timeout seconds for a WiFi connection.
+        
+        nm-online blocks on NetworkManager's own state change events, so
+        this returns as soon as NM connects instead of polling every second.
+        Falls back to polling if nm-online is missing or NM came up on
+        another interface (e.g. ethernet) without WiFi.
+        """
+        deadline = time.monotonic() + timeout
+        try:
+            subprocess.run(['nm-online', '-q', '-t', str(timeout)], timeout=timeout + 5)
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            pass
+        
+        # is_connected() is a sysfs read until wlan0 is up, so polling
+        # finely here is cheap and notices the connection sooner
+        while True:
+            if WiFiManager.is_connected():
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(0.2, remaining))
+    
     @staticmethod
     def get_current_ssid() -> str:
         """Get current connected SSID"""
@@ -75,63 +175,32 @@ class WiFiManager:
         }
     
     @staticmethod
-    def scan_networks() -> list[dict]:
-        """Scan for available networks using nmcli"""
-        subprocess.run(['nmcli', 'device', 'wifi', 'rescan'], capture_output=True)
-        time.sleep(2)
-        
-        result = subprocess.run(
-            ['nmcli', '-t', '-f', 'SSID,SIGNAL,SECURITY', 'device', 'wifi', 'list'],
-            capture_output=True, text=True
-        )
+    def scan_networks(force: bool = False) -> list[dict]:
+        """Scan for available networks using nmcli
         
-        networks = []
-        seen = set()
-        for line in result.stdout.strip().split('\n'):
-            if not line:
-                continue
-            parts = line.split(':')
-            ssid = parts[0]
-            if ssid and ssid not in seen and ssid != AP_SSID:
-                seen.add(ssid)
-                networks.append({
-                    "ssid": ssid,
-                    "signal": int(parts[1]) if len(parts) > 1 and parts[1] else 0,
-                    "security": parts[2] if len(parts) > 2 else ""
-                })
+        Args:
+            force: Rescan even if the cached results are less than SCAN_TTL old
+        """
+        if not force and time.monotonic() - _scan_cache["ts"] < SCAN_TTL:
+            return _scan_cache["nets"]
         
-        networks.sort(key=lambda x: x['signal'], reverse=True)
+        networks = [
+            {"ssid": ssid, "signal": signal, "security": security}
+            for ssid, signal, security, _ in _parse_wifi_list(_wifi_list(_SCAN_FIELDS))
+            if ssid != AP_SSID
+        ]
+        if networks:  # Don't hold on to a failed scan
+            _scan_cache["ts"] = time.monotonic()
+            _scan_cache["nets"] = networks
         return networks
     
     @staticmethod
     def scan_networks_extended() -> list[dict]:
         """Scan for networks with extended info (including connected status)"""
-        subprocess.run(['nmcli', 'device', 'wifi', 'rescan'], capture_output=True)
-        time.sleep(2)
-        
-        result = subprocess.run(
-            ['nmcli', '-t', '-f', 'SSID,SIGNAL,SECURITY,IN-USE', 'device', 'wifi', 'list'],
-            capture_output=True, text=True
-        )
-        
-        networks = []
-        seen = set()
-        for line in result.stdout.strip().split('\n'):
-            if not line:
-                continue
-            parts = line.split(':')
-            ssid = parts[0] if parts else ''
-            if ssid and ssid not in seen:
-                seen.add(ssid)
-                networks.append({
-                    "ssid": ssid,
-                    "signal": int(parts[1]) if len(parts) > 1 and parts[1] else 0,
-                    "security": parts[2] if len(parts) > 2 else "Open",
-                    "connected": parts[3] == '*' if len(parts) > 3 else False
-                })
-        
-        networks.sort(key=lambda x: x['signal'], reverse=True)
-        return networks
+        return [
+            {"ssid": ssid, "signal": signal, "security": security, "connected": in_use}
+            for ssid, signal, security, in_use in _parse_wifi_list(_wifi_list(_SCAN_FIELDS))
+        ]
     
     @staticmethod
     def get_saved_connections() -> list[dict]:
@@ -163,15 +232,18 @@ class WiFiManager:
     @staticmethod
     def start_ap() -> bool:
         """Start AP mode using NetworkManager. Returns True on success."""
-        # Check if hotspot exists
-        existing = subprocess.run(
-            ['nmcli', 'connection', 'show', AP_SSID],
-            capture_output=True
-        )
+        global _ap_profile_exists
+        if not _ap_profile_exists:
+            # Check if hotspot exists
+            existing = subprocess.run(
+                ['nmcli', '-t', '-f', 'NAME', 'connection', 'show'],
+                capture_output=True, text=True
+            )
+            _ap_profile_exists = AP_SSID in existing.stdout.splitlines()
         
-        if existing.returncode != 0:
+        if not _ap_profile_exists:
             # Create hotspot
-            subprocess.run([
+            created = subprocess.run([
                 'sudo', 'nmcli', 'connection', 'add',
                 'type', 'wifi',
                 'con-name', AP_SSID,
@@ -181,22 +253,28 @@ class WiFiManager:
                 'ipv4.method', 'shared',
                 'ipv4.addresses', f'{AP_IP}/24'
             ])
+            _ap_profile_exists = created.returncode == 0
         
         # Disconnect current WiFi and start AP
         subprocess.run(['sudo', 'nmcli', 'device', 'disconnect', 'wlan0'], 
-                      check=False, capture_output=True)
+                      check=False, stdout=_DEVNULL, stderr=_DEVNULL)
         time.sleep(1)
         result = subprocess.run(['sudo', 'nmcli', 'connection', 'up', AP_SSID], 
-                               capture_output=True)
-        time.sleep(2)
+                               stdout=_DEVNULL, stderr=_DEVNULL)
+        if result.returncode != 0:
+            return False
         
-        return result.returncode == 0
+        # Wait (up to 2s) for the AP to come up rather than always sleeping 2s
+        deadline = time.monotonic() + 2
+        while WiFiManager.get_current_ssid() != AP_SSID and time.monotonic() < deadline:
+            time.sleep(0.1)
+        return True
     
     @staticmethod
     def stop_ap() -> bool:
         """Stop AP mode. Returns True on success."""
         result = subprocess.run(['sudo', 'nmcli', 'connection', 'down', AP_SSID], 
-                               check=False, capture_output=True)
+                               check=False, stdout=_DEVNULL, stderr=_DEVNULL)
         return result.returncode == 0
     
     @staticmethod
@@ -212,14 +290,14 @@ class WiFiManager:
         # Check if connection already exists
         existing = subprocess.run(
             ['nmcli', 'connection', 'show', ssid],
-            capture_output=True, text=True
+            stdout=_DEVNULL, stderr=_DEVNULL
         )
         
         if existing.returncode == 0:
             # Existing connection - just activate it
             result = subprocess.run(
                 ['sudo', 'nmcli', 'connection', 'up', ssid],
-                capture_output=True, text=True, timeout=30
+                stdout=_DEVNULL, stderr=_DEVNULL, timeout=30
             )
         else:
             # New connection - need password
@@ -228,7 +306,7 @@ class WiFiManager:
             
             result = subprocess.run(
                 ['sudo', 'nmcli', 'device', 'wifi', 'connect', ssid, 'password', password],
-                capture_output=True, text=True, timeout=30
+                stdout=_DEVNULL, stderr=_DEVNULL, timeout=30
             )
         
         if result.returncode == 0:
@@ -244,7 +322,7 @@ class WiFiManager:
         """Disconnect from current WiFi (but keep saved). Returns True on success."""
         result = subprocess.run(
             ['sudo', 'nmcli', 'device', 'disconnect', 'wlan0'],
-            capture_output=True, text=True
+            stdout=_DEVNULL, stderr=_DEVNULL
         )
         return result.returncode == 0
     
@@ -256,8 +334,11 @@ class WiFiManager:
         
         result = subprocess.run(
             ['sudo', 'nmcli', 'connection', 'delete', name],
-            capture_output=True, text=True
+            stdout=_DEVNULL, stderr=_DEVNULL
         )
+        if name == AP_SSID:
+            global _ap_profile_exists
+            _ap_profile_exists = False
         return result.returncode == 0
     
     @staticmethod
@@ -269,7 +350,7 @@ class WiFiManager:
         result = subprocess.run(
             ['sudo', 'nmcli', 'connection', 'modify', name, 
              'connection.autoconnect-priority', str(priority)],
-            capture_output=True, text=True
+            stdout=_DEVNULL, stderr=_DEVNULL
         )
         return result.returncode == 0
     
@@ -278,7 +359,7 @@ class WiFiManager:
         """Let NetworkManager auto-connect to best available network."""
         result = subprocess.run(
             ['sudo', 'nmcli', 'device', 'connect', 'wlan0'],
-            capture_output=True, check=False
+            stdout=_DEVNULL, stderr=_DEVNULL, check=False
         )
         return result.returncode == 0
 
@@ -347,26 +428,55 @@ CAPTIVE_PORTAL_HTML = '''<!DOCTYPE html>
 </body>
 </html>'''
 
+# The template split around its two fields with the {{ }} escapes undone,
+# so a page is built by concatenating bytes instead of str.format() over
+# the whole template (and re-encoding it) on every request
+_HTML_HEAD, _rest = CAPTIVE_PORTAL_HTML.split('{content}')
+_HTML_MID, _HTML_TAIL = _rest.split('{connect_action}')
+_HTML_HEAD_BYTES = _HTML_HEAD.replace('{{', '{').replace('}}', '}').encode('utf-8')
+del _rest
+
 
-def render_network_list_html(networks: list[dict], connect_action: str = "/connect") -> str:
-    """Render the network list HTML content"""
-    content = '<h3>Select Network</h3>'
+@functools.lru_cache(maxsize=None)
+def _html_tail_bytes(connect_action: str) -> bytes:
+    """Encoded page tail for a form action (only a couple are ever used)"""
+    tail = (_HTML_MID + connect_action + _HTML_TAIL).replace('{{', '{').replace('}}', '}')
+    return tail.encode('utf-8')
+
+
+def _render_page(content: str, connect_action: str) -> bytes:
+    """Fill the captive portal template, returning the encoded page"""
+    return b''.join((_HTML_HEAD_BYTES, content.encode('utf-8'), _html_tail_bytes(connect_action)))
+
+
+# Signal bars by signal // 25 (at least one bar, even for a weak network)
+_SIGNAL_BARS = ('▂', '▂', '▂▄', '▂▄▆', '▂▄▆█')
+
+
+def render_network_list_html(networks: list[dict], connect_action: str = "/connect") -> bytes:
+    """Render the network list page (UTF-8 encoded)"""
+    parts = ['<h3>Select Network</h3>']
     for n in networks:
-        bars = '▂▄▆█'[:max(1, n['signal']//25)]
+        bars = _SIGNAL_BARS[min(4, n['signal'] // 25)]
         lock = '🔒' if n.get('security') else ''
-        content += f'''<div class="network" onclick="selectNetwork('{n["ssid"]}')">
-            <span>{n["ssid"]} {lock}</span>
+        # Escape once per row - an SSID is attacker-chosen text
+        ssid = html.escape(n["ssid"])
+        ssid_js = html.escape(json.dumps(n["ssid"]))
+        parts.append(f'''<div class="network" onclick="selectNetwork({ssid_js})">
+            <span>{ssid} {lock}</span>
             <span class="signal">{bars} {n["signal"]}%</span>
-        </div>'''
+        </div>''')
     
     if not networks:
-        content += '<p>No networks found. <a href="/" style="color:white">Refresh</a></p>'
+        parts.append('<p>No networks found. <a href="/" style="color:white">Refresh</a></p>')
     
-    return CAPTIVE_PORTAL_HTML.format(content=content, connect_action=connect_action)
+    content = ''.join(parts)
+    return _render_page(content, connect_action)
 
 
-def render_status_html(success: bool, ssid: str, connect_action: str = "/connect") -> str:
-    """Render the connection status HTML content"""
+def render_status_html(success: bool, ssid: str, connect_action: str = "/connect") -> bytes:
+    """Render the connection status page (UTF-8 encoded)"""
+    ssid = html.escape(ssid)
     if success:
         content = f'''<div class="status success">
             <h2>✅ Connected!</h2>
@@ -381,4 +491,4 @@ def render_status_html(success: bool, ssid: str, connect_action: str = "/connect
             <button onclick="location.href='/'">Try Again</button>
         </div>'''
     
-    return CAPTIVE_PORTAL_HTML.format(content=content, connect_action=connect_action)
+    return _render_page(content, connect_action)
@@ -35,6 +35,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from hardware.leds import RGBLeds, Colors
 from hardware.buttons import Buttons, ButtonID
 from utils.hardware_health import HardwareHealthManager
+from utils.logger import log
 from config.settings import (
     SERVER_HOST, 
     SERVER_PORT,
@@ -77,7 +78,7 @@ class HealthMonitor:
         # Get reference to health manager for button health checks
         self._health_manager = HardwareHealthManager.get_instance()
         
-        print("[HEALTH] Health monitor initialized")
+        log("Health monitor initialized", "HEALTH")
     
     def check_internet(self) -> bool:
         """Check internet connectivity by pinging Google DNS"""
@@ -103,7 +104,7 @@ class HealthMonitor:
             with urllib.request.urlopen(req, timeout=3) as response:
                 return response.status == 200
         except Exception as e:
-            print(f"[HEALTH] Server check failed: {e}")
+            log(f"Server check failed: {e}", "HEALTH")
             return False
     
     def check_hardware(self) -> bool:
@@ -121,10 +122,10 @@ class HealthMonitor:
                     # Server returns {"status": "active", "running": true}
                     result = data.get('running', False) or data.get('status') == 'active'
                     if not result:
-                        print(f"[HEALTH] Hardware check got: {data}")
+                        log(f"Hardware check got: {data}", "HEALTH")
                     return result
         except Exception as e:
-            print(f"[HEALTH] Hardware check failed: {e}")
+            log(f"Hardware check failed: {e}", "HEALTH")
         return False
     
     def update_led(self):
@@ -138,7 +139,7 @@ class HealthMonitor:
         
         # Only log if state changed
         if state != self._last_state:
-            print(f"[HEALTH] Internet={internet}, Server={server}, Hardware={hardware}")
+            log(f"Internet={internet}, Server={server}, Hardware={hardware}", "HEALTH")
             self._last_state = state
         
         # Set LED color based on state (R/G/B only)
@@ -164,7 +165,7 @@ class HealthMonitor:
     
     def boot_animation(self):
         """Blue blink animation during startup"""
-        print("[HEALTH] Boot animation...")
+        log("Boot animation...", "HEALTH")
         for _ in range(3):
             self._leds.set_light(self.LIGHT, Colors.BLUE)
             time.sleep(0.3)
@@ -173,7 +174,7 @@ class HealthMonitor:
     
     def _do_reboot(self):
         """Reboot the system"""
-        print("[HEALTH] *** REBOOTING SYSTEM ***")
+        log("*** REBOOTING SYSTEM ***", "HEALTH")
         # Visual feedback - rapid red blinks
         for _ in range(5):
             self._leds.set_light(self.LIGHT, Colors.RED)
@@ -184,13 +185,13 @@ class HealthMonitor:
         try:
             subprocess.run(['sudo', 'reboot'], check=True)
         except Exception as e:
-            print(f"[HEALTH] Reboot failed: {e}")
+            log(f"Reboot failed: {e}", "HEALTH")
             # Error indication - solid red
             self._leds.set_light(self.LIGHT, Colors.RED)
     
     def _do_restart_services(self):
         """Restart all smart speaker services"""
-        print("[HEALTH] *** RESTARTING SERVICES ***")
+        log("*** RESTARTING SERVICES ***", "HEALTH")
         # Visual feedback - rapid blue blinks
         for _ in range(5):
             self._leds.set_light(self.LIGHT, Colors.BLUE)
@@ -200,7 +201,7 @@ class HealthMonitor:
         
         for service in self.SERVICES_TO_RESTART:
             try:
-                print(f"[HEALTH] Restarting {service}...")
+                log(f"Restarting {service}...", "HEALTH")
                 result = subprocess.run(
                     ['sudo', 'systemctl', 'restart', service],
                     capture_output=True,
@@ -208,17 +209,17 @@ class HealthMonitor:
                     timeout=30
                 )
                 if result.returncode == 0:
-                    print(f"[HEALTH] {service} restarted successfully")
+                    log(f"{service} restarted successfully", "HEALTH")
                 else:
-                    print(f"[HEALTH] {service} restart failed: {result.stderr}")
+                    log(f"{service} restart failed: {result.stderr}", "HEALTH")
             except Exception as e:
-                print(f"[HEALTH] Failed to restart {service}: {e}")
+                log(f"Failed to restart {service}: {e}", "HEALTH")
         
-        print("[HEALTH] Service restart complete")
+        log("Service restart complete", "HEALTH")
     
     def _do_restart_health_service(self):
         """Restart the health monitor service itself"""
-        print("[HEALTH] *** RESTARTING HEALTH SERVICE ***")
+        log("*** RESTARTING HEALTH SERVICE ***", "HEALTH")
         try:
             # Use subprocess to restart ourselves - systemd will handle it
             subprocess.run(
@@ -226,7 +227,7 @@ class HealthMonitor:
                 check=True
             )
         except Exception as e:
-            print(f"[HEALTH] Failed to restart health service: {e}")
+            log(f"Failed to restart health service: {e}", "HEALTH")
     
     def _handle_button_errors(self) -> bool:
         """
@@ -251,7 +252,7 @@ class HealthMonitor:
             return True
         
         self._button_error_handling = True
-        print("[HEALTH] Button hardware errors detected - starting recovery")
+        log("Button hardware errors detected - starting recovery", "HEALTH")
         
         # Blink red LED for 10 seconds
         blink_start = time.time()
@@ -261,7 +262,7 @@ class HealthMonitor:
             self._leds.off(self.LIGHT)
             time.sleep(0.25)
         
-        print("[HEALTH] Red blink complete, restarting health service...")
+        log("Red blink complete, restarting health service...", "HEALTH")
         
         # Restart health service to reinitialize buttons
         self._do_restart_health_service()
@@ -314,9 +315,9 @@ class HealthMonitor:
     
     def run(self):
         """Main loop"""
-        print("[HEALTH] Starting health monitor service")
-        print(f"[HEALTH] Long press Vol Up ({LONG_PRESS_REBOOT_DURATION}s) -> Reboot")
-        print(f"[HEALTH] Long press Vol Down ({LONG_PRESS_RESTART_SERVICES_DURATION}s) -> Restart services")
+        log("Starting health monitor service", "HEALTH")
+        log(f"Long press Vol Up ({LONG_PRESS_REBOOT_DURATION}s) -> Reboot", "HEALTH")
+        log(f"Long press Vol Down ({LONG_PRESS_RESTART_SERVICES_DURATION}s) -> Restart services", "HEALTH")
         self._running = True
         
         # Boot animation
@@ -349,13 +350,13 @@ class HealthMonitor:
                         last_health_check = current_time
                 
             except Exception as e:
-                print(f"[HEALTH] Error: {e}")
+                log(f"Error: {e}", "HEALTH")
                 self._leds.set_light(self.LIGHT, Colors.RED)
             
             # Fast polling interval for responsive button detection
             time.sleep(LOOP_INTERVAL)
         
-        print("[HEALTH] Health monitor stopped")
+        log("Health monitor stopped", "HEALTH")
     
     def stop(self):
         """Stop the monitor"""
@@ -371,10 +372,10 @@ def main():
     try:
         monitor.run()
     except KeyboardInterrupt:
-        print("\n[HEALTH] Shutdown requested...")
+        log("Shutdown requested...", "HEALTH")
     finally:
         monitor.stop()
-        print("[HEALTH] Goodbye!")
+        log("Goodbye!", "HEALTH")
 
 
 if __name__ == '__main__':
@@ -6,51 +6,72 @@ This is the SINGLE SOURCE OF TRUTH for chip and library data.
 ChipStore reads from this same data file.
 """
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from socketserver import ThreadingMixIn
-from concurrent.futures import ThreadPoolExecutor
-from urllib.parse import parse_qs, urlparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs, unquote, urlparse
+import copy
+import gzip
 import json
-import uuid
+import mmap
+import secrets
 import os
-import cgi
+import re
+import signal
+import sys
 import threading
 import subprocess
 import time
-from utils.logger import log, log_success
+from utils.logger import log, log_error, log_success
+
+try:
+    import orjson  # Optional: much faster JSON encoding/decoding (pip install orjson)
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+    
+    def _dumps_indented(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    orjson = None
+    _loads = json.loads
+    
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    
+    def _dumps_indented(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
 from hardware.wifi_manager import (
     WiFiManager, AP_SSID, AP_IP, WEB_PORT,
     render_network_list_html, render_status_html
 )
 
 
-# Thread-pool HTTP server limited to 2 workers (suitable for single-core RPi)
-class ThreadPoolHTTPServer(ThreadingMixIn, HTTPServer):
-    """HTTP server that handles requests in a thread pool."""
-    
-    def __init__(self, server_address, RequestHandlerClass, max_workers=2):
-        super().__init__(server_address, RequestHandlerClass)
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
-        log(f"Server configured with {max_workers} worker threads")
-    
-    def process_request(self, request, client_address):
-        """Submit request to thread pool instead of creating unlimited threads."""
-        self.executor.submit(self.process_request_thread, request, client_address)
-    
-    def server_close(self):
-        """Shutdown thread pool when server closes."""
-        super().server_close()
-        self.executor.shutdown(wait=True)
+def _load_json_file(path: str):
+    """Parse a JSON file, with orjson straight from a read-only memory map
+    (no copy into a Python bytes object before the parser)."""
+    with open(path, 'rb') as f:
+        if orjson is None:
+            return json.load(f)
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return _loads(f.read())  # Empty file can't be mapped - let the parser report it
+        try:
+            with memoryview(mm) as view:
+                return _loads(view)
+        finally:
+            mm.close()
+
 
 # File paths - use Main directory for data storage
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_FILE = os.path.join(SCRIPT_DIR, 'server_data.json')
+DATA_LOG_FILE = os.path.join(SCRIPT_DIR, 'server_data.oplog')  # Changes since DATA_FILE was written
 OLD_TAGS_FILE = os.path.join(SCRIPT_DIR, 'config', 'tags.json')
 
 # Unified local_files directory structure
 LOCAL_FILES_DIR = os.path.join(SCRIPT_DIR, 'local_files')
 UPLOADS_DIR = os.path.join(LOCAL_FILES_DIR, 'uploads')
 RECORDINGS_DIR = os.path.join(LOCAL_FILES_DIR, 'recordings')
+MAX_UPLOAD_BYTES = 100 * 1024 * 1024  # Uploads are songs - refuse anything bigger
 
 # Ensure directories exist
 os.makedirs(UPLOADS_DIR, exist_ok=True)
@@ -88,8 +109,27 @@ DEFAULT_DATA = {
 
 # Thread-safe data access
 _data_lock = threading.Lock()
+_data_cache = None  # In-memory copy of DATA_FILE, see _get_data_unlocked()
+_chips_by_uid = {}  # NFC UID -> chip in _data_cache['chips']
+_data_version = 0  # Bumped on every save; tags the cached GET bodies below
+_json_cache = {}  # 'chips' / 'library' -> (data version, encoded list)
 _migration_done = False
 
+# Saves are written by a background thread so handlers don't wait on disk.
+# Edits arriving within SAVE_DELAY of each other are written out together.
+# Edits that name the records they changed are appended to DATA_LOG_FILE as
+# one JSON line per record; DATA_FILE is only rewritten (and the log emptied)
+# after COMPACT_AFTER_OPS logged changes or for an edit without a record list.
+SAVE_DELAY = 0.5
+COMPACT_AFTER_OPS = 500
+_save_pending = threading.Event()
+_save_write_lock = threading.Lock()  # One DATA_FILE writer at a time
+_save_thread = None
+_pending_changes = set()  # ('chips'|'library', id) or (top-level key,) changed since last write
+_pending_full = False  # Next write must be a full DATA_FILE rewrite
+_log_seq = 0  # Sequence number of the last change written (DATA_FILE stores it as '_seq')
+_log_ops = 0  # Lines in DATA_LOG_FILE
+
 def migrate_from_tags_json():
     """
     Migrate chips from old tags.json format to server_data.json.
@@ -115,8 +155,7 @@ def migrate_from_tags_json():
     
     # Load or create server_data
     if os.path.exists(DATA_FILE):
-        with open(DATA_FILE, 'r') as f:
-            data = json.load(f)
+        data = _load_json_file(DATA_FILE)
     else:
         data = {'chips': [], 'library': []}
     
@@ -145,7 +184,7 @@ def migrate_from_tags_json():
             
             # If not found, add to library
             if song_id is None:
-                song_id = f"song{uuid.uuid4().hex[:6]}"
+                song_id = f"song{secrets.token_hex(3)}"
                 data['library'].append({
                     'id': song_id,
                     'name': tag_data.get('name', 'Migrated Song'),
@@ -155,7 +194,7 @@ def migrate_from_tags_json():
         # Add chip
         chip_name = tag_data.get('name', f'Chip {len(data["chips"]) + 1}')
         data['chips'].append({
-            'id': f'chip{uuid.uuid4().hex[:6]}',
+            'id': f'chip{secrets.token_hex(3)}',
             'uid': uid,
             'name': chip_name,
             'song_id': song_id,
@@ -164,31 +203,57 @@ def migrate_from_tags_json():
         migrated_count += 1
     
     if migrated_count > 0:
-        with open(DATA_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        _write_data_file(data)
         log_success(f"Migrated {migrated_count} chips from tags.json to server_data.json")
 
-def load_data():
-    """Load data from JSON file, or create with defaults if not exists."""
-    # Run migration on first load
-    migrate_from_tags_json()
+def _get_data_unlocked() -> dict:
+    """Return the shared in-memory data (must be called with lock held).
     
-    with _data_lock:
+    The server is the only writer of DATA_FILE, so the file is parsed once
+    and every later read and mutation works on this cached dict.
+    """
+    global _data_cache
+    if _data_cache is None:
+        # Run migration on first load
+        migrate_from_tags_json()
+        
         if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, 'r') as f:
-                data = json.load(f)
-                # Ensure chips and library keys exist
-                if 'chips' not in data:
-                    data['chips'] = []
-                if 'library' not in data:
-                    data['library'] = []
-                # Ensure parental_controls key exists
-                if 'parental_controls' not in data:
-                    data['parental_controls'] = DEFAULT_DATA['parental_controls'].copy()
-                return data
+            data = _load_json_file(DATA_FILE)
+            # Chips and library are kept as {id: item} in memory (insertion ordered)
+            data['chips'] = {chip['id']: chip for chip in data.get('chips', [])}
+            data['library'] = {song['id']: song for song in data.get('library', [])}
+            _replay_data_log(data, data.pop('_seq', 0))
+            # Ensure parental_controls key exists
+            if 'parental_controls' not in data:
+                data['parental_controls'] = copy.deepcopy(DEFAULT_DATA['parental_controls'])
+            _data_cache = data
         else:
-            save_data_unlocked(DEFAULT_DATA)
-            return DEFAULT_DATA.copy()
+            data = copy.deepcopy(DEFAULT_DATA)
+            data['chips'] = {}
+            data['library'] = {song['id']: song for song in data['library']}
+            save_data_unlocked(data)
+        for chip in _data_cache['chips'].values():
+            if chip.get('uid'):
+                _chips_by_uid.setdefault(chip['uid'], chip)  # First chip wins, as before
+    return _data_cache
+
+
+def get_list_json(key: str) -> bytes:
+    """JSON body for the chip or library list, re-encoded only after changes."""
+    with _data_lock:
+        data = _get_data_unlocked()
+        cached = _json_cache.get(key)
+        if cached is not None and cached[0] == _data_version:
+            return cached[1]
+        body = _dumps(list(data[key].values()))
+        _json_cache[key] = (_data_version, body)
+        return body
+
+
+def load_data():
+    """Load data (from memory after the first read), creating defaults if needed."""
+    with _data_lock:
+        return _get_data_unlocked()
 
 
 def get_parental_controls() -> dict:
@@ -200,14 +265,10 @@ def get_parental_controls() -> dict:
 def update_parental_controls(settings: dict) -> dict:
     """Update parental control settings."""
     with _data_lock:
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, 'r') as f:
-                data = json.load(f)
-        else:
-            data = DEFAULT_DATA.copy()
+        data = _get_data_unlocked()
         
         if 'parental_controls' not in data:
-            data['parental_controls'] = DEFAULT_DATA['parental_controls'].copy()
+            data['parental_controls'] = copy.deepcopy(DEFAULT_DATA['parental_controls'])
         
         # Update only provided fields
         pc = data['parental_controls']
@@ -232,20 +293,145 @@ def update_parental_controls(settings: dict) -> dict:
         if 'chip_whitelist' in settings:
             pc['chip_whitelist'] = settings['chip_whitelist']
         
-        save_data_unlocked(data)
+        save_data_unlocked(data, ('parental_controls',))
         log(f"Updated parental controls: {pc}")
         return pc
 
-def save_data_unlocked(data):
-    """Save data to JSON file (must be called with lock held)."""
-    with open(DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+def _apply_change(data, change: dict):
+    """Apply one DATA_LOG_FILE entry to the in-memory data."""
+    value = change.get('value')
+    if 'id' in change:
+        records = data.setdefault(change['key'], {})
+        if value is None:
+            records.pop(change['id'], None)
+        else:
+            records[change['id']] = value
+    else:
+        data[change['key']] = value
+
+def _replay_data_log(data, snapshot_seq: int):
+    """Re-apply the changes logged after DATA_FILE was written."""
+    global _log_seq, _log_ops, _pending_full
+    _log_seq = snapshot_seq
+    try:
+        with open(DATA_LOG_FILE, 'rb') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return
+    for line in lines:
+        try:
+            change = _loads(line)
+        except ValueError:
+            log_error(f"Ignoring the rest of {DATA_LOG_FILE} (incomplete entry)")
+            _pending_full = True  # Don't append after the broken line
+            break
+        _log_ops += 1
+        # Entries at or below the snapshot's seq are already in DATA_FILE
+        if change['seq'] > _log_seq:
+            _apply_change(data, change)
+            _log_seq = change['seq']
+
+def _write_data_file(data):
+    """Write data to DATA_FILE as-is."""
+    _write_data_bytes(_dumps_indented(data))
+
+def _write_data_bytes(body: bytes):
+    """Write serialized data to DATA_FILE.
+    
+    Writes to a temp file, fsyncs and renames it over DATA_FILE so a crash
+    or power cut mid-write never leaves a truncated data file behind.
+    """
+    tmp_file = DATA_FILE + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(body)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, DATA_FILE)
+
+def save_data_unlocked(data, *changes):
+    """Save in-memory data (must be called with lock held).
+    
+    Only marks the data as changed; the writer thread writes it out
+    shortly after, outside the request.
+    
+    Args:
+        data: The shared data dict
+        *changes: Records that changed - ('chips', chip_id), ('library', song_id)
+            or (top_level_key,). Without any, the whole file is rewritten.
+    """
+    global _data_cache, _data_version, _save_thread, _pending_full
+    _data_cache = data
+    _data_version += 1
+    if changes:
+        _pending_changes.update(changes)
+    else:
+        _pending_full = True
+    _save_pending.set()
+    if _save_thread is None:
+        _save_thread = threading.Thread(target=_save_worker, daemon=True, name="DataWriter")
+        _save_thread.start()
 
 def save_data(data):
     """Save data to JSON file (thread-safe)."""
     with _data_lock:
         save_data_unlocked(data)
 
+def _save_worker():
+    """Write DATA_FILE whenever the data has changed"""
+    while True:
+        _save_pending.wait()
+        time.sleep(SAVE_DELAY)  # Let a burst of edits land in one write
+        flush_data()
+
+def flush_data():
+    """Write any unsaved changes to DATA_FILE / DATA_LOG_FILE now (blocking)."""
+    global _pending_full, _log_seq, _log_ops
+    with _save_write_lock:
+        with _data_lock:
+            if not _save_pending.is_set():
+                return
+            # Cleared under the lock, so an edit after this snapshot sets it again
+            _save_pending.clear()
+            data = _data_cache
+            compact = _pending_full or _log_ops + len(_pending_changes) > COMPACT_AFTER_OPS
+            if compact:
+                # The chip and library dicts are written out as lists, the on-disk format
+                body = _dumps_indented(dict(data, chips=list(data['chips'].values()),
+                                            library=list(data['library'].values()),
+                                            _seq=_log_seq))
+            else:
+                # One line per changed record, with its current value (None = deleted)
+                lines = []
+                for change in _pending_changes:
+                    _log_seq += 1
+                    entry = {'seq': _log_seq, 'key': change[0]}
+                    if len(change) == 2:
+                        entry['id'] = change[1]
+                        entry['value'] = data[change[0]].get(change[1])
+                    else:
+                        entry['value'] = data.get(change[0])
+                    lines.append(_dumps(entry) + b'\n')
+                body = b''.join(lines)
+            _pending_changes.clear()
+            _pending_full = False
+        try:
+            if compact:
+                _write_data_bytes(body)
+                with open(DATA_LOG_FILE, 'wb'):
+                    pass  # Everything logged is in DATA_FILE now
+                _log_ops = 0
+            else:
+                with open(DATA_LOG_FILE, 'ab') as f:
+                    f.write(body)
+                    f.flush()
+                    os.fsync(f.fileno())
+                _log_ops += len(lines)
+        except OSError as e:
+            log_error(f"Could not save {DATA_FILE}: {e}")
+            with _data_lock:
+                _pending_full = True  # Log may be partly written - rewrite everything next time
+            _save_pending.set()  # Try again with the next write
+
 
 # =============================================================================
 # DAILY USAGE TRACKING
@@ -260,11 +446,7 @@ def _get_today_str() -> str:
 def get_daily_usage() -> dict:
     """Get today's usage data. Resets if date changed."""
     with _data_lock:
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, 'r') as f:
-                data = json.load(f)
-        else:
-            data = DEFAULT_DATA.copy()
+        data = _get_data_unlocked()
         
         usage = data.get('daily_usage', {})
         today = _get_today_str()
@@ -273,7 +455,7 @@ def get_daily_usage() -> dict:
         if usage.get('date') != today:
             usage = {'date': today, 'seconds': 0}
             data['daily_usage'] = usage
-            save_data_unlocked(data)
+            save_data_unlocked(data, ('daily_usage',))
         
         return usage
 
@@ -281,11 +463,7 @@ def get_daily_usage() -> dict:
 def add_daily_usage(seconds: int) -> dict:
     """Add seconds to today's usage. Returns updated usage."""
     with _data_lock:
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, 'r') as f:
-                data = json.load(f)
-        else:
-            data = DEFAULT_DATA.copy()
+        data = _get_data_unlocked()
         
         today = _get_today_str()
         usage = data.get('daily_usage', {})
@@ -297,7 +475,7 @@ def add_daily_usage(seconds: int) -> dict:
         # Add usage
         usage['seconds'] = usage.get('seconds', 0) + max(0, int(seconds))
         data['daily_usage'] = usage
-        save_data_unlocked(data)
+        save_data_unlocked(data, ('daily_usage',))
         
         log(f"Daily usage updated: {usage['seconds']} seconds")
         return usage
@@ -309,59 +487,177 @@ def register_new_chip(uid: str, name: str = None) -> dict:
     Returns the new chip data.
     """
     with _data_lock:
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, 'r') as f:
-                data = json.load(f)
-        else:
-            data = DEFAULT_DATA.copy()
+        data = _get_data_unlocked()
         
         # Check if chip already exists
-        for chip in data.get('chips', []):
-            if chip.get('uid') == uid:
-                return chip
+        chip = _chips_by_uid.get(uid)
+        if chip is not None:
+            return chip
         
         # Create new chip
-        chip_num = len(data.get('chips', [])) + 1
+        chip_num = len(data['chips']) + 1
         new_chip = {
-            'id': f'chip{uuid.uuid4().hex[:6]}',
+            'id': f'chip{secrets.token_hex(3)}',
             'uid': uid,
             'name': name or f'Chip {chip_num}',
             'song_id': None,
             'song_name': None,
         }
         
-        if 'chips' not in data:
-            data['chips'] = []
-        data['chips'].append(new_chip)
-        save_data_unlocked(data)
+        data['chips'][new_chip['id']] = new_chip
+        _chips_by_uid[uid] = new_chip
+        save_data_unlocked(data, ('chips', new_chip['id']))
         
         log(f"Registered new chip: {new_chip['name']} (UID: {uid[:20]}...)")
         return new_chip
 
+def get_chip_by_uid(uid: str):
+    """
+    Look up a chip by NFC UID with its song URI resolved.
+    Returns None if no chip has this UID.
+    """
+    with _data_lock:
+        data = _get_data_unlocked()
+        chip = _chips_by_uid.get(uid)
+        if chip is None:
+            return None
+        song_id = chip.get('song_id')
+        song = data['library'].get(song_id) if song_id else None
+        return {
+            'uid': uid,
+            'name': chip.get('name', 'Unknown'),
+            'uri': song.get('uri', '') if song else '',
+            'song_id': song_id,
+            'song_name': chip.get('song_name', ''),
+        }
+
+
 def add_to_library(uri: str, name: str):
     """
     Add a file to the library (thread-safe).
     Used for both recordings and uploads.
     """
     with _data_lock:
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, 'r') as f:
-                data = json.load(f)
-        else:
-            data = DEFAULT_DATA.copy()
+        data = _get_data_unlocked()
         
         new_song = {
-            "id": f"song{uuid.uuid4().hex[:6]}",
+            "id": f"song{secrets.token_hex(3)}",
             "name": name,
             "uri": uri,
         }
-        if 'library' not in data:
-            data['library'] = []
-        data['library'].append(new_song)
-        save_data_unlocked(data)
+        data['library'][new_song['id']] = new_song
+        save_data_unlocked(data, ('library', new_song['id']))
         log(f"Added to library: {name} ({uri})")
 
 
+# =============================================================================
+# FILE UPLOADS
+# =============================================================================
+
+UPLOAD_CHUNK = 1024 * 1024  # Upload bodies are read and written in 1 MiB chunks
+MAX_PART_HEADER_BYTES = 16 * 1024
+_BOUNDARY_RE = re.compile(r'boundary="?([^";]+)"?', re.IGNORECASE)
+_DISPOSITION_PARAM_RE = re.compile(r'(\w+)=(?:"([^"]*)"|([^;\s]+))')  # Quoted or token value
+
+
+def save_multipart_upload(rfile, boundary: bytes, length: int):
+    """
+    Stream the 'file' field of a multipart/form-data body into UPLOADS_DIR.
+    
+    The body is scanned for the boundary chunk by chunk as it arrives and the
+    file part is written straight to its final path - it is never held in
+    memory whole or spooled to a temp file first.
+    
+    Args:
+        rfile: Request body stream
+        boundary: Multipart boundary from the Content-Type header
+        length: Content-Length of the body (all of it is consumed)
+    
+    Returns:
+        (original filename, saved path), or None if the form had no file
+    
+    Raises:
+        ValueError: Malformed or truncated body
+    """
+    delimiter = b'\r\n--' + boundary
+    keep = len(delimiter) - 1  # Tail that may hold the start of a split delimiter
+    remaining = length
+    buf = b'\r\n'  # So the first boundary line matches like the others
+    
+    def fill():
+        nonlocal buf, remaining
+        chunk = rfile.read(min(UPLOAD_CHUNK, remaining)) if remaining > 0 else b''
+        if not chunk:
+            raise ValueError("Truncated multipart body")
+        remaining -= len(chunk)
+        buf += chunk
+    
+    def copy_part(out):
+        """Consume buf up to the next delimiter, writing it to out (None = discard)"""
+        nonlocal buf
+        while True:
+            idx = buf.find(delimiter)
+            if idx >= 0:
+                if out is not None:
+                    out.write(memoryview(buf)[:idx])
+                buf = buf[idx + len(delimiter):]
+                return
+            if len(buf) > keep:
+                if out is not None:
+                    out.write(memoryview(buf)[:-keep])
+                buf = buf[-keep:]
+            fill()
+    
+    copy_part(None)  # Preamble
+    saved = None
+    while True:
+        while len(buf) < 2:
+            fill()
+        if buf.startswith(b'--'):
+            break  # Closing delimiter
+        
+        # Part headers end with a blank line
+        while True:
+            end = buf.find(b'\r\n\r\n')
+            if end >= 0:
+                break
+            if len(buf) > MAX_PART_HEADER_BYTES:
+                raise ValueError("Multipart headers too large")
+            fill()
+        headers = buf[:end].decode('utf-8', 'replace')
+        buf = buf[end + 4:]
+        
+        params = {}
+        for line in headers.split('\r\n'):
+            header, _, value = line.partition(':')
+            if header.strip().lower() == 'content-disposition':
+                params = {key.lower(): quoted or token
+                          for key, quoted, token in _DISPOSITION_PARAM_RE.findall(value)}
+        
+        filename = params.get('filename')
+        if saved is None and params.get('name') == 'file' and filename:
+            # Generate unique filename
+            file_ext = os.path.splitext(filename)[1] or '.mp3'
+            filepath = os.path.join(UPLOADS_DIR, f"{secrets.token_hex(4)}{file_ext}")
+            try:
+                with open(filepath, 'wb') as f:
+                    copy_part(f)
+            except BaseException:
+                os.unlink(filepath)
+                raise
+            saved = (filename, filepath)
+        else:
+            copy_part(None)
+    
+    # Drain the epilogue so the connection is left at the next request
+    while remaining > 0:
+        chunk = rfile.read(min(UPLOAD_CHUNK, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+    return saved
+
+
 # =============================================================================
 # DEBUG / DEVELOPER TOOL FUNCTIONS
 # =============================================================================
@@ -681,375 +977,390 @@ def wifi_ap_mode(enable: bool = True) -> dict:
         return {"error": str(e)}
 
 
+# /status is polled constantly and never changes - encode it once
+_STATUS_BYTES = _dumps({"connected": True})
+
+# JSON bodies larger than this are gzipped for clients that accept it
+GZIP_MIN_BYTES = 1024
+_gzip_cache = {}  # cache key -> (body, gzipped body), for the cached list bodies
+
+
 class SpeakerHandler(BaseHTTPRequestHandler):
+    # Keep connections open between requests (every response has a
+    # Content-Length) so the app's polling doesn't reconnect each time
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes - don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+    # Drop connections idle this long so kept-alive sockets don't pin threads
+    timeout = 30
+    
     def log_message(self, format, *args):
         """Override to use our logger instead of default logging"""
         log(f"HTTP {format % args}")
     
     def _send_json(self, response_data, status=200):
+        self._send_json_bytes(_dumps(response_data), status)
+
+    def _send_json_bytes(self, body: bytes, status=200, cache_key=None):
+        """Send an already-encoded JSON body, gzipped if large and accepted.
+        
+        Args:
+            body: Encoded JSON
+            status: HTTP status code
+            cache_key: Set for bodies that are sent repeatedly, so the
+                gzipped version is only compressed once per body
+        """
         self.send_response(status)
         self.send_header('Content-Type', 'application/json')
         self.send_header('Access-Control-Allow-Origin', '*')
+        if len(body) > GZIP_MIN_BYTES and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            cached = _gzip_cache.get(cache_key) if cache_key else None
+            if cached is not None and cached[0] is body:
+                body = cached[1]
+            else:
+                gzipped = gzip.compress(body, compresslevel=1)  # Speed over ratio
+                if cache_key:
+                    _gzip_cache[cache_key] = (body, gzipped)
+                body = gzipped
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps(response_data).encode())
+        self.wfile.write(body)
 
     def _send_ok(self, status=200):
         self.send_response(status)
         self.send_header('Access-Control-Allow-Origin', '*')
+        if status != 204:  # 204 must not carry a Content-Length
+            self.send_header('Content-Length', '0')
         self.end_headers()
 
     def _read_body(self):
+        self._body_read = True
         length = int(self.headers.get('Content-Length', 0))
-        return json.loads(self.rfile.read(length)) if length else {}
+        return _loads(self.rfile.read(length)) if length else {}
+
+    def _dispatch(self, method):
+        """Look up the handler for this request in the route tables.
+        
+        The path is parsed once (query string and trailing slash removed);
+        exact paths hit a dict, parameterized paths are tried against
+        precompiled regexes.
+        """
+        path = urlparse(self.path).path.rstrip('/')
+        self._body_read = False
+        
+        try:
+            handler = _ROUTES[method].get(path)
+            if handler is not None:
+                handler(self)
+                return
+            
+            for pattern, handler in _PATTERN_ROUTES.get(method, ()):
+                match = pattern.match(path)
+                if match:
+                    handler(self, *match.groups())
+                    return
+            
+            self.send_error(404)
+        finally:
+            # A body the handler didn't read would be parsed as the next
+            # request on this connection - close it instead
+            if not self._body_read and self.headers.get('Content-Length', '0') not in ('', '0'):
+                self.close_connection = True
 
     def do_OPTIONS(self):
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
         self.end_headers()
 
     def do_GET(self):
-        # Parse path to handle query strings
-        parsed = urlparse(self.path)
-        path = parsed.path.rstrip('/')  # Normalize trailing slashes
-        
-        # Captive portal detection URLs - redirect to WiFi setup
-        # Android, iOS, Windows, etc. use these to detect captive portals
-        captive_portal_paths = [
-            '/generate_204', '/gen_204', '/ncsi.txt',  # Android/Chrome
-            '/canonical.html', '/success.txt',  # Various
-        ]
-        
-        if path in captive_portal_paths or path == '':
-            # Redirect to WiFi setup page
-            self.send_response(302)
-            self.send_header('Location', '/wifi-setup')
-            self.end_headers()
-            return
-        
-        if path == '/status':
-            self._send_json({"connected": True})
-        elif path == '/health':
-            # Return hardware health status for all components
-            from utils.hardware_health import HardwareHealthManager
-            manager = HardwareHealthManager.get_instance()
-            health_data = {
-                name: {
-                    "status": h.status.value,
-                    "last_error": h.last_error,
-                    "error_count": h.error_count
-                }
-                for name, h in manager.get_all_status().items()
+        self._dispatch('GET')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    # =========================================================================
+    # GET handlers
+    # =========================================================================
+
+    def _redirect_to_wifi_setup(self):
+        """Captive portal detection - redirect to WiFi setup page"""
+        self.send_response(302)
+        self.send_header('Location', '/wifi-setup')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _get_status(self):
+        self._send_json_bytes(_STATUS_BYTES)
+
+    def _get_health(self):
+        """Return hardware health status for all components"""
+        from utils.hardware_health import HardwareHealthManager
+        manager = HardwareHealthManager.get_instance()
+        health_data = {
+            name: {
+                "status": h.status.value,
+                "last_error": h.last_error,
+                "error_count": h.error_count
             }
-            self._send_json(health_data)
-        elif path == '/chips':
-            data = load_data()
-            self._send_json(data.get('chips', []))
-        elif path == '/library':
-            data = load_data()
-            self._send_json(data.get('library', []))
-        elif path == '/settings/parental':
-            self._send_json(get_parental_controls())
-        elif self.path == '/usage/today':
-            self._send_json(get_daily_usage())
-        # Debug endpoints
-        elif path == '/debug/i2c':
-            self._send_json(debug_get_i2c_devices())
-        elif path == '/debug/system':
-            self._send_json(debug_get_system_info())
-        elif path == '/debug/logs':
-            self._send_json(debug_get_logs())
-        elif path == '/debug/git-status':
-            self._send_json(debug_get_git_status())
-        elif path == '/debug/speaker/status':
-            self._send_json(debug_speaker_status())
-        # WiFi endpoints
-        elif path == '/debug/wifi/status':
-            self._send_json(wifi_get_status())
-        elif path == '/debug/wifi/connections':
-            self._send_json(wifi_get_connections())
-        elif path == '/debug/wifi/scan':
-            self._send_json(wifi_scan())
-        # Captive portal WiFi setup page
-        elif path == '/wifi-setup':
-            self._serve_wifi_setup_page()
-        else:
+            for name, h in manager.get_all_status().items()
+        }
+        self._send_json(health_data)
+
+    def _get_chips(self):
+        self._send_json_bytes(get_list_json('chips'), cache_key='chips')
+
+    def _get_library(self):
+        self._send_json_bytes(get_list_json('library'), cache_key='library')
+
+    def _get_chip_by_uid(self, uid):
+        """Single resolved chip for the speaker: GET /chips/uid/<uid>"""
+        chip = get_chip_by_uid(unquote(uid))
+        if chip is None:
             self.send_error(404)
-    
+            return
+        self._send_json(chip)
+
     def _serve_wifi_setup_page(self):
-        """Serve the WiFi setup captive portal page"""
+        """Serve the WiFi setup captive portal page (?rescan=1 forces a fresh scan)"""
         try:
-            networks = WiFiManager.scan_networks()
+            query = parse_qs(urlparse(self.path).query)
+            networks = WiFiManager.scan_networks(force=query.get('rescan') == ['1'])
             html = render_network_list_html(networks, connect_action="/wifi-setup/connect")
             self.send_response(200)
             self.send_header('Content-type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(html)))
             self.end_headers()
-            self.wfile.write(html.encode('utf-8'))
+            self.wfile.write(html)
         except Exception as e:
             self.send_error(500, str(e))
 
-    def do_PUT(self):
-        if self.path == '/settings/parental':
-            body = self._read_body()
-            updated = update_parental_controls(body)
-            self._send_json(updated)
-            return
+    # =========================================================================
+    # PUT handlers
+    # =========================================================================
+
+    def _put_parental(self):
+        body = self._read_body()
+        updated = update_parental_controls(body)
+        self._send_json(updated)
+
+    def _put_chip(self, chip_id):
+        body = self._read_body()
         
-        if self.path.startswith('/chips/'):
-            chip_id = self.path.split('/')[2]
-            body = self._read_body()
-            
-            with _data_lock:
-                if os.path.exists(DATA_FILE):
-                    with open(DATA_FILE, 'r') as f:
-                        data = json.load(f)
-                else:
-                    self.send_error(404)
-                    return
-                
-                for chip in data.get('chips', []):
-                    if chip['id'] == chip_id:
-                        if 'name' in body:
-                            chip['name'] = body['name']
-                        if 'song_id' in body:
-                            chip['song_id'] = body['song_id']
-                            # Find song name and URI from library
-                            chip['song_name'] = None
-                            for song in data.get('library', []):
-                                if song['id'] == body['song_id']:
-                                    chip['song_name'] = song['name']
-                                    break
-                        save_data_unlocked(data)
-                        log(f"Updated chip {chip_id}: {chip}")
-                        self._send_json(chip)
-                        return
-                
-            self.send_error(404)
+        with _data_lock:
+            data = _get_data_unlocked()
             
-        elif self.path.startswith('/library/'):
-            song_id = self.path.split('/')[2]
-            body = self._read_body()
+            chip = data['chips'].get(chip_id)
+            if chip is not None:
+                if 'name' in body:
+                    chip['name'] = body['name']
+                if 'song_id' in body:
+                    chip['song_id'] = body['song_id']
+                    # Find song name from library
+                    song = data['library'].get(body['song_id'])
+                    chip['song_name'] = song['name'] if song else None
+                save_data_unlocked(data, ('chips', chip_id))
+                log(f"Updated chip {chip_id}: {chip}")
+                self._send_json(chip)
+                return
             
-            with _data_lock:
-                if os.path.exists(DATA_FILE):
-                    with open(DATA_FILE, 'r') as f:
-                        data = json.load(f)
-                else:
-                    self.send_error(404)
-                    return
-                
-                for song in data.get('library', []):
-                    if song['id'] == song_id:
-                        song['name'] = body.get('name', song['name'])
-                        song['uri'] = body.get('uri', song['uri'])
-                        save_data_unlocked(data)
-                        log(f"Updated song {song_id}: {song}")
-                        self._send_json(song)
-                        return
-                
-            self.send_error(404)
-        else:
-            self.send_error(404)
+        self.send_error(404)
 
-    def do_DELETE(self):
-        if '/chips/' in self.path and self.path.endswith('/assignment'):
-            chip_id = self.path.split('/')[2]
-            
-            with _data_lock:
-                if os.path.exists(DATA_FILE):
-                    with open(DATA_FILE, 'r') as f:
-                        data = json.load(f)
-                else:
-                    self.send_error(404)
-                    return
-                
-                for chip in data.get('chips', []):
-                    if chip['id'] == chip_id:
-                        chip['song_id'] = None
-                        chip['song_name'] = None
-                        save_data_unlocked(data)
-                        log(f"Reset assignment for chip {chip_id}")
-                        self._send_ok(204)
-                        return
-                
-            self.send_error(404)
+    def _put_song(self, song_id):
+        body = self._read_body()
         
-        elif self.path.startswith('/chips/'):
-            # Delete a chip: DELETE /chips/{chip_id}
-            chip_id = self.path.split('/')[2]
+        with _data_lock:
+            data = _get_data_unlocked()
             
-            with _data_lock:
-                if os.path.exists(DATA_FILE):
-                    with open(DATA_FILE, 'r') as f:
-                        data = json.load(f)
-                else:
-                    self.send_error(404)
-                    return
-                
-                for i, chip in enumerate(data.get('chips', [])):
-                    if chip['id'] == chip_id:
-                        data['chips'].pop(i)
-                        save_data_unlocked(data)
-                        log(f"Deleted chip {chip_id}")
-                        self._send_ok(204)
-                        return
-                
-            self.send_error(404)
+            song = data['library'].get(song_id)
+            if song is not None:
+                song['name'] = body.get('name', song['name'])
+                song['uri'] = body.get('uri', song['uri'])
+                save_data_unlocked(data, ('library', song_id))
+                log(f"Updated song {song_id}: {song}")
+                self._send_json(song)
+                return
             
-        elif self.path.startswith('/library/'):
-            song_id = self.path.split('/')[2]
+        self.send_error(404)
+
+    # =========================================================================
+    # DELETE handlers
+    # =========================================================================
+
+    def _delete_chip_assignment(self, chip_id):
+        with _data_lock:
+            data = _get_data_unlocked()
             
-            with _data_lock:
-                if os.path.exists(DATA_FILE):
-                    with open(DATA_FILE, 'r') as f:
-                        data = json.load(f)
-                else:
-                    self.send_error(404)
-                    return
-                
-                for i, song in enumerate(data.get('library', [])):
-                    if song['id'] == song_id:
-                        data['library'].pop(i)
-                        # Cascade: clear song from any chips that reference it
-                        for chip in data.get('chips', []):
-                            if chip.get('song_id') == song_id:
-                                chip['song_id'] = None
-                                chip['song_name'] = None
-                                log(f"Cleared song {song_id} from chip {chip['id']}")
-                        save_data_unlocked(data)
-                        log(f"Deleted song {song_id}")
-                        self._send_ok(204)
-                        return
-                
-            self.send_error(404)
-        else:
-            self.send_error(404)
+            chip = data['chips'].get(chip_id)
+            if chip is not None:
+                chip['song_id'] = None
+                chip['song_name'] = None
+                save_data_unlocked(data, ('chips', chip_id))
+                log(f"Reset assignment for chip {chip_id}")
+                self._send_ok(204)
+                return
+            
+        self.send_error(404)
 
-    def do_POST(self):
-        if self.path == '/chips':
-            # Register a new chip: POST /chips {uid: "...", name: "..."}
-            body = self._read_body()
-            uid = body.get('uid')
-            name = body.get('name')
+    def _delete_chip(self, chip_id):
+        """Delete a chip: DELETE /chips/{chip_id}"""
+        with _data_lock:
+            data = _get_data_unlocked()
             
-            if not uid:
-                self._send_json({"error": "uid is required"}, 400)
+            chip = data['chips'].pop(chip_id, None)
+            if chip is not None:
+                uid = chip.get('uid')
+                if _chips_by_uid.get(uid) is chip:
+                    del _chips_by_uid[uid]
+                    # Fall back to another chip with the same UID, if any
+                    for other in data['chips'].values():
+                        if other.get('uid') == uid:
+                            _chips_by_uid[uid] = other
+                            break
+                save_data_unlocked(data, ('chips', chip_id))
+                log(f"Deleted chip {chip_id}")
+                self._send_ok(204)
                 return
             
-            new_chip = register_new_chip(uid, name)
-            self._send_json(new_chip, 201)
+        self.send_error(404)
+
+    def _delete_song(self, song_id):
+        with _data_lock:
+            data = _get_data_unlocked()
             
-        elif self.path == '/library':
-            body = self._read_body()
-            new_song = {
-                "id": f"song{uuid.uuid4().hex[:6]}",
-                "name": body.get('name', ''),
-                "uri": body.get('uri', ''),
-            }
+            if data['library'].pop(song_id, None) is not None:
+                changes = [('library', song_id)]
+                # Cascade: clear song from any chips that reference it
+                for chip in data['chips'].values():
+                    if chip.get('song_id') == song_id:
+                        chip['song_id'] = None
+                        chip['song_name'] = None
+                        changes.append(('chips', chip['id']))
+                        log(f"Cleared song {song_id} from chip {chip['id']}")
+                save_data_unlocked(data, *changes)
+                log(f"Deleted song {song_id}")
+                self._send_ok(204)
+                return
             
-            with _data_lock:
-                if os.path.exists(DATA_FILE):
-                    with open(DATA_FILE, 'r') as f:
-                        data = json.load(f)
-                else:
-                    data = {'chips': [], 'library': []}
-                
-                data['library'].append(new_song)
-                save_data_unlocked(data)
+        self.send_error(404)
+
+    # =========================================================================
+    # POST handlers
+    # =========================================================================
+
+    def _post_chip(self):
+        """Register a new chip: POST /chips {uid: "...", name: "..."}"""
+        body = self._read_body()
+        uid = body.get('uid')
+        name = body.get('name')
+        
+        if not uid:
+            self._send_json({"error": "uid is required"}, 400)
+            return
+        
+        new_chip = register_new_chip(uid, name)
+        self._send_json(new_chip, 201)
+
+    def _post_song(self):
+        body = self._read_body()
+        new_song = {
+            "id": f"song{secrets.token_hex(3)}",
+            "name": body.get('name', ''),
+            "uri": body.get('uri', ''),
+        }
+        
+        with _data_lock:
+            data = _get_data_unlocked()
             
-            log(f"Added song: {new_song}")
-            self._send_json(new_song, 201)
+            data['library'][new_song['id']] = new_song
+            save_data_unlocked(data, ('library', new_song['id']))
         
-        elif self.path == '/usage/add':
-            body = self._read_body()
-            seconds = body.get('seconds', 0)
-            updated = add_daily_usage(seconds)
-            self._send_json(updated)
+        log(f"Added song: {new_song}")
+        self._send_json(new_song, 201)
+
+    def _post_usage(self):
+        body = self._read_body()
+        seconds = body.get('seconds', 0)
+        updated = add_daily_usage(seconds)
+        self._send_json(updated)
+
+    def _post_file(self):
+        """Handle multipart file upload"""
+        content_type = self.headers.get('Content-Type', '')
+        if 'multipart/form-data' in content_type:
+            length = int(self.headers.get('Content-Length') or 0)
+            if length > MAX_UPLOAD_BYTES:
+                self.send_error(413)
+                return
+            if length <= 0:
+                self.send_error(411)
+                return
+            boundary = _BOUNDARY_RE.search(content_type)
+            if boundary is None:
+                self.send_error(400, "Missing multipart boundary")
+                return
+            
+            self._body_read = True  # Read in full, or the connection is closed on error
+            try:
+                saved = save_multipart_upload(self.rfile, boundary.group(1).encode('latin-1'), length)
+            except ValueError as e:
+                self.send_error(400, str(e))
+                return
             
-        elif self.path == '/files':
-            # Handle multipart file upload
-            content_type = self.headers.get('Content-Type', '')
-            if 'multipart/form-data' in content_type:
-                form = cgi.FieldStorage(
-                    fp=self.rfile,
-                    headers=self.headers,
-                    environ={'REQUEST_METHOD': 'POST',
-                             'CONTENT_TYPE': content_type}
-                )
+            if saved is not None:
+                filename, filepath = saved
+                uri = f"file://{filepath}"
+                # Extract original filename for display name
+                original_name = os.path.splitext(filename)[0]
+                display_name = f"[UPLOAD] {original_name}"
                 
-                if 'file' in form:
-                    file_item = form['file']
-                    if file_item.filename:
-                        # Generate unique filename
-                        file_ext = os.path.splitext(file_item.filename)[1] or '.mp3'
-                        file_id = uuid.uuid4().hex[:8]
-                        filename = f"{file_id}{file_ext}"
-                        filepath = os.path.join(UPLOADS_DIR, filename)
-                        
-                        # Save the file
-                        with open(filepath, 'wb') as f:
-                            f.write(file_item.file.read())
-                        
-                        uri = f"file://{filepath}"
-                        # Extract original filename for display name
-                        original_name = os.path.splitext(file_item.filename)[0]
-                        display_name = f"[UPLOAD] {original_name}"
-                        
-                        # Add to library automatically
-                        add_to_library(uri, display_name)
-                        
-                        log(f"Uploaded file: {filepath} (added to library as '{display_name}')")
-                        self._send_json({"uri": uri, "name": display_name}, 201)
-                        return
+                # Add to library automatically
+                add_to_library(uri, display_name)
+                
+                log(f"Uploaded file: {filepath} (added to library as '{display_name}')")
+                self._send_json({"uri": uri, "name": display_name}, 201)
+                return
             
-            # Fallback for non-multipart
-            file_id = uuid.uuid4().hex[:8]
-            uri = f"file://{UPLOADS_DIR}/{file_id}.mp3"
-            display_name = f"[UPLOAD] {file_id}"
-            add_to_library(uri, display_name)
-            self._send_json({"uri": uri, "name": display_name}, 201)
+            self.send_error(400, "No file part in upload")
+            return
         
-        # Debug POST endpoints
-        elif self.path == '/debug/git-pull':
-            self._send_json(debug_git_pull())
-        # Speaker service control (hardware controller)
-        elif self.path == '/debug/speaker/start':
-            self._send_json(debug_speaker_start())
-        elif self.path == '/debug/speaker/stop':
-            self._send_json(debug_speaker_stop())
-        elif self.path == '/debug/speaker/restart':
-            self._send_json(debug_speaker_restart())
-        elif self.path == '/debug/daemon-reload':
-            self._send_json(debug_daemon_reload())
-        elif self.path == '/debug/run-main':
-            self._send_json(debug_run_main())
-        elif self.path == '/debug/reboot':
-            self._send_json(debug_reboot())
-        # WiFi POST endpoints
-        elif self.path == '/debug/wifi/connect':
-            body = self._read_body()
-            self._send_json(wifi_connect(body.get('ssid'), body.get('password')))
-        elif self.path == '/debug/wifi/disconnect':
-            self._send_json(wifi_disconnect())
-        elif self.path == '/debug/wifi/forget':
-            body = self._read_body()
-            self._send_json(wifi_forget(body.get('name')))
-        elif self.path == '/debug/wifi/priority':
-            body = self._read_body()
-            self._send_json(wifi_set_priority(body.get('name'), body.get('priority', 0)))
-        elif self.path == '/debug/wifi/ap-mode':
-            body = self._read_body() or {}
-            self._send_json(wifi_ap_mode(body.get('enable', True)))
-        # Captive portal WiFi connect handler
-        elif self.path == '/wifi-setup/connect' or self.path.startswith('/wifi-setup/connect?'):
-            self._handle_wifi_setup_connect()
-        else:
-            self.send_error(404)
+        # Fallback for non-multipart
+        file_id = secrets.token_hex(4)
+        uri = f"file://{UPLOADS_DIR}/{file_id}.mp3"
+        display_name = f"[UPLOAD] {file_id}"
+        add_to_library(uri, display_name)
+        self._send_json({"uri": uri, "name": display_name}, 201)
+
+    def _post_wifi_connect(self):
+        body = self._read_body()
+        self._send_json(wifi_connect(body.get('ssid'), body.get('password')))
+
+    def _post_wifi_forget(self):
+        body = self._read_body()
+        self._send_json(wifi_forget(body.get('name')))
+
+    def _post_wifi_priority(self):
+        body = self._read_body()
+        self._send_json(wifi_set_priority(body.get('name'), body.get('priority', 0)))
+
+    def _post_wifi_ap_mode(self):
+        body = self._read_body() or {}
+        self._send_json(wifi_ap_mode(body.get('enable', True)))
     
     def _handle_wifi_setup_connect(self):
         """Handle WiFi connection from captive portal form"""
         try:
+            self._body_read = True
             length = int(self.headers.get('Content-Length', 0))
             data = parse_qs(self.rfile.read(length).decode())
             ssid = data.get('ssid', [''])[0]
@@ -1061,8 +1372,9 @@ class SpeakerHandler(BaseHTTPRequestHandler):
             html = render_status_html(success, ssid, connect_action="/wifi-setup/connect")
             self.send_response(200)
             self.send_header('Content-type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(html)))
             self.end_headers()
-            self.wfile.write(html.encode('utf-8'))
+            self.wfile.write(html)
             
             if success:
                 log_success(f"WiFi setup: connected to {ssid}")
@@ -1077,6 +1389,87 @@ class SpeakerHandler(BaseHTTPRequestHandler):
             self.send_error(500, str(e))
 
 
+def _json_route(func):
+    """Route handler that responds with func()'s result as JSON"""
+    return lambda handler: handler._send_json(func())
+
+
+# Captive portal detection URLs - redirect to WiFi setup
+# Android, iOS, Windows, etc. use these to detect captive portals
+CAPTIVE_PORTAL_PATHS = (
+    '', '/generate_204', '/gen_204', '/ncsi.txt',  # Android/Chrome
+    '/canonical.html', '/success.txt',  # Various
+)
+
+# Exact-match routes: {method: {path: handler(request_handler)}}
+_ROUTES = {
+    'GET': {
+        **{path: SpeakerHandler._redirect_to_wifi_setup for path in CAPTIVE_PORTAL_PATHS},
+        '/status': SpeakerHandler._get_status,
+        '/health': SpeakerHandler._get_health,
+        '/chips': SpeakerHandler._get_chips,
+        '/library': SpeakerHandler._get_library,
+        '/settings/parental': _json_route(get_parental_controls),
+        '/usage/today': _json_route(get_daily_usage),
+        # Debug endpoints
+        '/debug/i2c': _json_route(debug_get_i2c_devices),
+        '/debug/system': _json_route(debug_get_system_info),
+        '/debug/logs': _json_route(debug_get_logs),
+        '/debug/git-status': _json_route(debug_get_git_status),
+        '/debug/speaker/status': _json_route(debug_speaker_status),
+        # WiFi endpoints
+        '/debug/wifi/status': _json_route(wifi_get_status),
+        '/debug/wifi/connections': _json_route(wifi_get_connections),
+        '/debug/wifi/scan': _json_route(wifi_scan),
+        # Captive portal WiFi setup page
+        '/wifi-setup': SpeakerHandler._serve_wifi_setup_page,
+    },
+    'PUT': {
+        '/settings/parental': SpeakerHandler._put_parental,
+    },
+    'DELETE': {},
+    'POST': {
+        '/chips': SpeakerHandler._post_chip,
+        '/library': SpeakerHandler._post_song,
+        '/usage/add': SpeakerHandler._post_usage,
+        '/files': SpeakerHandler._post_file,
+        # Debug POST endpoints
+        '/debug/git-pull': _json_route(debug_git_pull),
+        # Speaker service control (hardware controller)
+        '/debug/speaker/start': _json_route(debug_speaker_start),
+        '/debug/speaker/stop': _json_route(debug_speaker_stop),
+        '/debug/speaker/restart': _json_route(debug_speaker_restart),
+        '/debug/daemon-reload': _json_route(debug_daemon_reload),
+        '/debug/run-main': _json_route(debug_run_main),
+        '/debug/reboot': _json_route(debug_reboot),
+        # WiFi POST endpoints
+        '/debug/wifi/connect': SpeakerHandler._post_wifi_connect,
+        '/debug/wifi/disconnect': _json_route(wifi_disconnect),
+        '/debug/wifi/forget': SpeakerHandler._post_wifi_forget,
+        '/debug/wifi/priority': SpeakerHandler._post_wifi_priority,
+        '/debug/wifi/ap-mode': SpeakerHandler._post_wifi_ap_mode,
+        # Captive portal WiFi connect handler
+        '/wifi-setup/connect': SpeakerHandler._handle_wifi_setup_connect,
+    },
+}
+
+# Parameterized routes: {method: [(compiled_regex, handler(request_handler, *groups))]}
+_PATTERN_ROUTES = {
+    'GET': [
+        (re.compile(r'^/chips/uid/([^/]+)$'), SpeakerHandler._get_chip_by_uid),
+    ],
+    'PUT': [
+        (re.compile(r'^/chips/([^/]+)$'), SpeakerHandler._put_chip),
+        (re.compile(r'^/library/([^/]+)$'), SpeakerHandler._put_song),
+    ],
+    'DELETE': [
+        (re.compile(r'^/chips/([^/]+)/assignment$'), SpeakerHandler._delete_chip_assignment),
+        (re.compile(r'^/chips/([^/]+)$'), SpeakerHandler._delete_chip),
+        (re.compile(r'^/library/([^/]+)$'), SpeakerHandler._delete_song),
+    ],
+}
+
+
 def run_server_blocking(port=8080, host='0.0.0.0'):
     """
     Run the HTTP server in the main thread (blocking).
@@ -1084,7 +1477,13 @@ def run_server_blocking(port=8080, host='0.0.0.0'):
     Use this for standalone server service mode where the server
     is the main process and should run until terminated.
     """
-    server = ThreadPoolHTTPServer((host, port), SpeakerHandler, max_workers=2)
+    # A thread per connection: a slow upload or WiFi scan can't hold up the
+    # app's status polls (shared data is guarded by _data_lock)
+    server = ThreadingHTTPServer((host, port), SpeakerHandler)
+    server.daemon_threads = True
+    # systemd stops the service with SIGTERM - exit through the finally
+    # below so pending data is saved
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     log_success(f"HTTP Server started on http://{host}:{port}")
     log(f"  - Data file: {DATA_FILE}")
     log(f"  - Local files directory: {LOCAL_FILES_DIR}")
@@ -1096,4 +1495,5 @@ def run_server_blocking(port=8080, host='0.0.0.0'):
         log("Server shutdown requested...")
     finally:
         server.server_close()
+        flush_data()
         log("Server stopped.")
@@ -8,43 +8,95 @@ Light 3 is split across two expanders:
 - Red: P6 on 0x20
 """
 
+import queue
 import threading
-import time
+from dataclasses import dataclass
+from typing import Optional
 from hardware.leds import RGBLeds, Colors
 from utils.logger import log
 
 
+@dataclass(frozen=True)
+class LightPolicy:
+    """Colors used by Lights for each feedback state (BGR tuples from Colors)"""
+    idle: tuple = Colors.BLUE
+    playing: tuple = Colors.GREEN
+    paused: tuple = Colors.BLUE
+    recording: tuple = Colors.RED
+    loaded_flash: tuple = Colors.GREEN
+    loaded_return_to: tuple = Colors.BLUE
+    success_flash: tuple = Colors.GREEN
+    error_flash: tuple = Colors.RED
+    volume_flash: tuple = Colors.BLUE
+
+
+# Speaker LED (Light 3) color scheme
+SPEAKER_POLICY = LightPolicy()
+
+
 class Lights:
     """
     High-level LED state management for speaker/player feedback.
-    Controls Light 3 (Divided LED) on PCF8574.
+    Controls one RGB LED (default: Light 3, the Divided LED) on PCF8574.
     
     This class implements the interface already called by UIController:
     - show_idle(), show_chip_loaded(), show_playing(), show_paused()
     - show_recording(), show_success(), show_error(), show_volume()
     
-    Color scheme (R/G/B only):
+    Colors come from a LightPolicy. Default scheme (SPEAKER_POLICY):
     - GREEN: Playing
     - BLUE: Idle/Pause
     - RED: Recording
     - RED blinking: Error
+    
+    Passing policy=None disables the LED entirely.
     """
     
     LIGHT = 3  # Speaker uses Light 3 (divided LED)
     
-    def __init__(self, leds=None):
-        """Initialize lights controller"""
+    _instance: Optional["Lights"] = None
+    _instance_lock = threading.Lock()
+    
+    def __init__(self, leds=None, light: int = LIGHT, policy: Optional[LightPolicy] = SPEAKER_POLICY):
+        """Initialize lights controller
+        
+        Args:
+            leds: RGBLeds instance (creates new one if not provided)
+            light: LED number to drive (1, 2 or 3)
+            policy: Color scheme, or None to disable this LED
+        """
         self._leds = None
         self._enabled = False
-        self._flash_thread = None
+        self._light = light
+        self._policy = policy
+        
+        # Single worker drains LED tasks in order (latest request wins)
+        self._queue = queue.Queue()
+        self._next = threading.Event()
+        
+        if policy is None:
+            log(f"[LIGHTS] Light {light} disabled (no policy)")
+            return
         
         try:
             self._leds = leds or RGBLeds()
             self._enabled = True
-            log("[LIGHTS] Speaker LED initialized (Light 3 - Divided)")
+            log(f"[LIGHTS] LED initialized (Light {light})")
         except Exception as e:
             log(f"[LIGHTS] Failed to initialize: {e} - LEDs disabled")
             self._enabled = False
+        
+        if self._enabled:
+            self._worker = threading.Thread(target=self._run, daemon=True)
+            self._worker.start()
+    
+    @classmethod
+    def get_instance(cls) -> "Lights":
+        """Get the shared instance (one device/driver per process)"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
     
     # =========================================================================
     # SOLID STATES
@@ -53,27 +105,27 @@ class Lights:
     def show_idle(self):
         """Chip cleared / Idle - blue solid"""
         if self._enabled:
-            self._leds.set_light(self.LIGHT, Colors.BLUE)
+            self._solid(self._policy.idle)
     
     def show_chip_loaded(self):
         """Chip scanned/loaded - green flash then blue (idle)"""
         if self._enabled:
-            self._flash(Colors.GREEN, duration=0.2, return_to=Colors.BLUE)
+            self._flash(self._policy.loaded_flash, duration=0.2, return_to=self._policy.loaded_return_to)
     
     def show_playing(self):
         """Playing - green solid"""
         if self._enabled:
-            self._leds.set_light(self.LIGHT, Colors.GREEN)
+            self._solid(self._policy.playing)
     
     def show_paused(self):
         """Paused - blue solid"""
         if self._enabled:
-            self._leds.set_light(self.LIGHT, Colors.BLUE)
+            self._solid(self._policy.paused)
     
     def show_recording(self):
         """Recording - red solid"""
         if self._enabled:
-            self._leds.set_light(self.LIGHT, Colors.RED)
+            self._solid(self._policy.recording)
     
     # =========================================================================
     # FLASH PATTERNS
@@ -82,50 +134,75 @@ class Lights:
     def show_success(self):
         """Success (recording saved) - green flash"""
         if self._enabled:
-            self._flash(Colors.GREEN, duration=0.5)
+            self._flash(self._policy.success_flash, duration=0.5)
     
     def show_error(self):
         """Error or blocked action - red triple flash"""
         if self._enabled:
-            self._multi_flash(Colors.RED, times=3, on_time=0.1, off_time=0.1)
+            self._multi_flash(self._policy.error_flash, times=3, on_time=0.1, off_time=0.1)
     
     def show_volume(self, volume: int):
         """Volume change - blue brief flash"""
         if self._enabled:
-            self._flash(Colors.BLUE, duration=0.1)
+            self._flash(self._policy.volume_flash, duration=0.1)
     
     def off(self):
-        """Turn off speaker LED"""
+        """Turn off the LED"""
         if self._enabled:
-            self._leds.off(self.LIGHT)
+            self._solid(Colors.OFF)
     
     # =========================================================================
-    # FLASH HELPERS (non-blocking)
+    # WORKER (non-blocking for callers)
     # =========================================================================
     
+    def _submit(self, task):
+        """Queue an LED task and interrupt any flash still in progress"""
+        self._queue.put(task)  # Queued before the interrupt, so _run can't clear it unseen
+        self._next.set()
+    
+    def _run(self):
+        """Worker loop - runs only the most recent pending task"""
+        while True:
+            task = self._queue.get()
+            # Clear before draining - a task put after this point sets it again
+            self._next.clear()
+            while not self._queue.empty():
+                task = self._queue.get_nowait()
+            try:
+                task()
+            except Exception as e:
+                log(f"[LIGHTS] Task error: {e}")
+    
+    def _wait(self, seconds: float) -> bool:
+        """Sleep for a flash step. Returns False if a newer task arrived."""
+        return not self._next.wait(seconds)
+    
+    def _solid(self, color: tuple):
+        """Set a solid color (queued behind/after any pending flash)"""
+        self._submit(lambda: self._leds.set_light(self._light, color))
+    
     def _flash(self, color: tuple, duration: float = 0.2, return_to: tuple = None):
         """Single flash then off or return to color (non-blocking)"""
         def do_flash():
-            self._leds.set_light(self.LIGHT, color)
-            time.sleep(duration)
+            self._leds.set_light(self._light, color)
+            if not self._wait(duration):
+                return
             if return_to:
-                self._leds.set_light(self.LIGHT, return_to)
+                self._leds.set_light(self._light, return_to)
             else:
-                self._leds.off(self.LIGHT)
+                self._leds.off(self._light)
         
-        # Run in background thread so it doesn't block
-        thread = threading.Thread(target=do_flash, daemon=True)
-        thread.start()
+        self._submit(do_flash)
     
     def _multi_flash(self, color: tuple, times: int = 3, on_time: float = 0.1, off_time: float = 0.1):
         """Multiple flashes (non-blocking)"""
         def do_multi():
             for i in range(times):
-                self._leds.set_light(self.LIGHT, color)
-                time.sleep(on_time)
-                self._leds.off(self.LIGHT)
-                if i < times - 1:
-                    time.sleep(off_time)
+                self._leds.set_light(self._light, color)
+                if not self._wait(on_time):
+                    return
+                self._leds.off(self._light)
+                if i < times - 1 and not self._wait(off_time):
+                    return
         
-        thread = threading.Thread(target=do_multi, daemon=True)
-        thread.start()
+        self._submit(do_multi)
@@ -1,18 +1,59 @@
 """
 Play WAVs (chip-loaded beep, error beep…) through Mopidy
+(or directly through ALSA when UI_SOUND_DEVICE is set)
 """
 
+import functools
 import os
+import queue
+import threading
 import time
+from typing import Optional
 
 from config import paths
+from config.settings import UI_SOUND_DEVICE
 from utils.logger import log_sound, log_error
 from hardware.audio_player import AudioPlayer
 
 
+# Built-in UI sounds: name -> (filepath, log label), resolved once at import.
+# Each entry is playable as Sounds.play_<name>().
+SOUNDS = {
+    "chip_loaded": (paths.SOUND_CHIP_LOADED, "CHIP LOADED"),
+    "play": (paths.SOUND_PLAY, "PLAY"),
+    "pause": (paths.SOUND_PAUSE, "PAUSE"),
+    "stop": (paths.SOUND_STOP, "STOP"),
+    "error": (paths.SOUND_ERROR, "ERROR"),
+    "record_start": (paths.SOUND_RECORD_START, "RECORD START"),
+    "record_saved": (paths.SOUND_RECORD_SAVED, "RECORD SAVED"),
+    "record_canceled": (paths.SOUND_RECORD_CANCELED, "RECORD CANCELED"),
+    "blocked": (paths.SOUND_BLOCKED, "BLOCKED"),
+    "reset": (paths.SOUND_RESET, "RESET"),
+    "swipe": (paths.SOUND_SWIPE, "SWIPE (no action)"),
+}
+
+
+# filepath -> file:// URI, for files found to exist (misses are not cached,
+# so a sound file added later is picked up)
+_found_uris = {}
+
+
+def _file_uri(filepath: str):
+    """file:// URI for filepath, or None if the file does not exist"""
+    uri = _found_uris.get(filepath)
+    if uri is None:
+        if not os.path.exists(filepath):
+            return None
+        uri = _found_uris[filepath] = f"file://{os.path.abspath(filepath)}"
+    return uri
+
+
 class Sounds:
     """WAV sound playback for UI feedback using Mopidy"""
     
+    _instance: Optional["Sounds"] = None
+    _instance_lock = threading.Lock()
+    
     def __init__(self, sounds_dir: str = None, cooldown: float = 0.1, audio_player: AudioPlayer = None):
         """Initialize sound player
         
@@ -22,34 +63,122 @@ class Sounds:
             audio_player: AudioPlayer instance (creates new one if not provided)
         """
         self._sounds_dir = sounds_dir or paths.SOUNDS_DIR
-        self._cooldown = cooldown
-        self._last_sound_time = 0.0
+        self._cooldown_ns = int(cooldown * 1e9)
+        self._last_sound_ns = -self._cooldown_ns  # First sound is never skipped
         self._audio_player = audio_player or AudioPlayer()
-        log_sound(f"Sounds initialized (dir: {self._sounds_dir}, cooldown: {cooldown}s)")
+        self._uris = self._preload(self._sounds_dir)
+        self._check_known_sounds()
+        self._alsa = self._init_alsa(UI_SOUND_DEVICE)
+        if self._alsa:
+            count = self._alsa.preload(self._uris)
+            log_sound(f"Decoded {count} sounds into memory for ALSA playback")
+            # One playback thread; at most one sound waits behind the current one
+            self._queue = queue.Queue(maxsize=1)
+            self._enqueue_lock = threading.Lock()
+            threading.Thread(target=self._alsa_worker, daemon=True).start()
+        log_sound(f"Sounds initialized (dir: {self._sounds_dir}, {len(self._uris)} sounds, cooldown: {cooldown}s)")
+    
+    @classmethod
+    def get_instance(cls) -> "Sounds":
+        """Get the shared instance (one device/driver per process)"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+    
+    @staticmethod
+    def _preload(sounds_dir: str) -> dict:
+        """Index the WAV files in sounds_dir once as {filepath: file:// URI}
+        
+        Mopidy reads the file itself, so caching the resolved URI is what
+        saves work per sound (no path resolution on each playback).
+        """
+        uris = {}
+        try:
+            for entry in os.scandir(sounds_dir):
+                if entry.is_file() and entry.name.lower().endswith(".wav"):
+                    uris[entry.path] = f"file://{os.path.abspath(entry.path)}"
+        except OSError as e:
+            log_error(f"Cannot read sounds directory {sounds_dir}: {e}")
+        return uris
+    
+    def _check_known_sounds(self):
+        """Resolve the paths.SOUND_* files once; report missing ones at startup"""
+        for filepath, _ in SOUNDS.values():
+            if filepath in self._uris:
+                continue
+            if os.path.isfile(filepath):
+                self._uris[filepath] = f"file://{os.path.abspath(filepath)}"
+            else:
+                log_error(f"Sound file not found: {filepath}")
+    
+    @staticmethod
+    def _init_alsa(device: str):
+        """Open the direct ALSA player if a UI sound device is configured"""
+        if not device:
+            return None
+        try:
+            from hardware.alsa_player import AlsaPlayer
+            return AlsaPlayer(device)
+        except Exception as e:
+            log_error(f"Direct ALSA sounds unavailable ({e}) - using Mopidy")
+            return None
+    
+    def _alsa_worker(self):
+        """Playback thread - writes queued sounds to the persistent ALSA PCM"""
+        while True:
+            filepath, name, generation = self._queue.get()
+            try:
+                self._alsa.play_file(filepath, generation)
+            except Exception as e:
+                log_error(f"Failed to play sound {name} through ALSA: {e}")
+    
+    def _enqueue(self, filepath: str, name: str):
+        """Queue a sound for the playback thread (newest sound wins)"""
+        # Preempt the sound being played rather than wait for it to finish -
+        # the new generation also makes the worker skip anything dequeued
+        # before this. Interrupt and put together, so concurrent callers
+        # can't queue an older generation after a newer one.
+        with self._enqueue_lock:
+            generation = self._alsa.interrupt()
+            while True:
+                try:
+                    self._queue.put_nowait((filepath, name, generation))
+                    return
+                except queue.Full:
+                    try:
+                        self._queue.get_nowait()
+                    except queue.Empty:
+                        pass
     
     def _play_file(self, filepath: str, name: str):
         """Play a WAV file through Mopidy"""
-        current_time = time.time()
+        # Monotonic integer clock: immune to NTP jumps, no float math per call
+        now = time.monotonic_ns()
         
         # Check cooldown
-        if current_time - self._last_sound_time < self._cooldown:
+        if now - self._last_sound_ns < self._cooldown_ns:
             log_sound(f"[SKIPPED] {name} (cooldown)")
             return
         
-        if not os.path.exists(filepath):
+        # Convert filepath to file:// URI for Mopidy (preloaded if known,
+        # otherwise memoized per path once the file exists)
+        uri = self._uris.get(filepath) or _file_uri(filepath)
+        if uri is None:
             log_error(f"Sound file not found: {filepath}")
             return
         
         log_sound(f"🔊 Playing: {name}")
         
+        if self._alsa:
+            self._enqueue(filepath, name)
+            self._last_sound_ns = now
+            return
+        
         try:
-            # Convert filepath to file:// URI for Mopidy
-            abs_path = os.path.abspath(filepath)
-            uri = f"file://{abs_path}"
-            
             # Play through Mopidy
             self._audio_player.play_uri(uri)
-            self._last_sound_time = current_time
+            self._last_sound_ns = now
         except Exception as e:
             log_error(f"Failed to play sound through Mopidy: {e}")
     
@@ -58,52 +187,26 @@ class Sounds:
         filepath = os.path.join(self._sounds_dir, sound_name)
         self._play_file(filepath, sound_name)
     
-    def play_chip_loaded(self):
-        """Play chip loaded beep"""
-        self._play_file(paths.SOUND_CHIP_LOADED, "CHIP LOADED")
-    
-    def play_play(self):
-        """Play start playback chime"""
-        self._play_file(paths.SOUND_PLAY, "PLAY")
-    
-    def play_pause(self):
-        """Play pause click"""
-        self._play_file(paths.SOUND_PAUSE, "PAUSE")
-    
-    def play_stop(self):
-        """Play stop tone"""
-        self._play_file(paths.SOUND_STOP, "STOP")
-    
-    def play_error(self):
-        """Play error beep"""
-        self._play_file(paths.SOUND_ERROR, "ERROR")
-    
-    def play_record_start(self):
-        """Play record start beep"""
-        self._play_file(paths.SOUND_RECORD_START, "RECORD START")
-    
-    def play_record_saved(self):
-        """Play record saved chime"""
-        self._play_file(paths.SOUND_RECORD_SAVED, "RECORD SAVED")
-    
-    def play_record_canceled(self):
-        """Play record canceled tone"""
-        self._play_file(paths.SOUND_RECORD_CANCELED, "RECORD CANCELED")
-    
-    def play_blocked(self):
-        """Play blocked action beep"""
-        self._play_file(paths.SOUND_BLOCKED, "BLOCKED")
-    
-    def play_reset(self):
-        """Play reset tone (longer stop for clear chip)"""
-        self._play_file(paths.SOUND_RESET, "RESET")
-    
-    def play_swipe(self):
-        """Play soft no-action click (same chip scanned)"""
-        self._play_file(paths.SOUND_SWIPE, "SWIPE (no action)")
+    def __getattr__(self, name: str):
+        """play_<sound>() for every entry in SOUNDS (e.g. play_chip_loaded)"""
+        entry = SOUNDS.get(name[5:]) if name.startswith("play_") else None
+        if entry is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        method = functools.partial(self._play_file, *entry)
+        setattr(self, name, method)  # Found directly on later calls
+        return method
     
     def stop(self):
         """Stop any currently playing sound"""
+        if self._alsa:
+            # Drop the sound waiting behind the current one, cut the current
+            # one short (including one the worker has just dequeued)
+            with self._enqueue_lock:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self._alsa.interrupt()
         try:
             self._audio_player.stop()
             log_sound("[STOPPED] Current sound")
@@ -2,86 +2,143 @@
 Sound+light combined events (on_play(), etc.)
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import time
 
 from ui.sounds import Sounds
 from ui.lights import Lights
-from utils.logger import log_event
+from utils.logger import log_event, log_event_bytes, encode_event
+
+
+# Fixed event log lines, encoded once
+_L_CHIP_LOADED = encode_event("📀 CHIP LOADED")
+_L_SAME_CHIP = encode_event("📀 Same chip scanned (no action)")
+_L_PLAY = encode_event("▶️  PLAY")
+_L_PAUSE = encode_event("⏸️  PAUSE")
+_L_STOP = encode_event("⏹️  STOP")
+_L_CLEAR_CHIP = encode_event("🔄 CLEAR CHIP (Reset)")
+_L_RECORDING_STARTED = encode_event("🎙️  RECORDING STARTED")
+_L_RECORDING_SAVED = encode_event("💾 RECORDING SAVED")
+_L_RECORDING_CANCELED = encode_event("❌ RECORDING CANCELED")
+_L_BLOCKED = encode_event("🚫 ACTION BLOCKED")
+_L_ERROR = encode_event("❌ ERROR")
 
 
 class UIController:
-    """Unified UI feedback controller combining sounds and lights"""
+    """Unified UI feedback controller combining sounds and lights
+    
+    Each event submits its light change first: Lights only queues the task
+    for its worker thread, so the LED updates while the (blocking) sound
+    command is still in flight instead of after it.
+    """
+    
+    # Same event repeated within this window is coalesced (seconds)
+    DEDUPE_WINDOW = 0.1
     
     def __init__(self, sounds: Sounds = None, lights: Lights = None):
         """Initialize UI controller"""
-        self._sounds = sounds or Sounds()
-        self._lights = lights or Lights()
+        self._sounds = sounds or Sounds.get_instance()
+        self._lights = lights or Lights.get_instance()
+        self._last_event = None
+        self._last_event_time = 0.0
         log_event("UI Controller initialized")
     
+    def _is_repeat(self, event: str) -> bool:
+        """True if the same event already fired within DEDUPE_WINDOW.
+        
+        Skips the sound, light and log line for rapid duplicates
+        (e.g. the same chip re-scanned) before any of them run.
+        """
+        now = time.monotonic()
+        if event == self._last_event and now - self._last_event_time < self.DEDUPE_WINDOW:
+            return True
+        self._last_event = event
+        self._last_event_time = now
+        return False
+    
     def on_chip_loaded(self):
         """Feedback when chip is loaded"""
-        log_event("📀 CHIP LOADED")
-        self._sounds.play_chip_loaded()
+        if self._is_repeat("chip_loaded"):
+            return
+        log_event_bytes(_L_CHIP_LOADED)
         self._lights.show_chip_loaded()
+        self._sounds.play_chip_loaded()
     
     def on_same_chip_scanned(self):
         """Feedback when same chip is scanned (no effect)"""
-        log_event("📀 Same chip scanned (no action)")
+        if self._is_repeat("same_chip_scanned"):
+            return
+        log_event_bytes(_L_SAME_CHIP)
         self._sounds.play_swipe()
     
     def on_play(self):
         """Feedback when playback starts/resumes"""
-        log_event("▶️  PLAY")
+        if self._is_repeat("play"):
+            return
+        log_event_bytes(_L_PLAY)
         self._lights.show_playing()
     
     def on_pause(self):
         """Feedback when playback pauses"""
-        log_event("⏸️  PAUSE")
+        if self._is_repeat("pause"):
+            return
+        log_event_bytes(_L_PAUSE)
         self._lights.show_paused()
     
     def on_stop(self):
         """Feedback when playback stops"""
-        log_event("⏹️  STOP")
-        self._sounds.play_stop()
+        if self._is_repeat("stop"):
+            return
+        log_event_bytes(_L_STOP)
         self._lights.show_chip_loaded()
+        self._sounds.play_stop()
     
     def on_clear_chip(self):
         """Feedback when chip is cleared (reset)"""
-        log_event("🔄 CLEAR CHIP (Reset)")
-        self._sounds.play_reset()
+        if self._is_repeat("clear_chip"):
+            return
+        log_event_bytes(_L_CLEAR_CHIP)
         self._lights.show_idle()
+        self._sounds.play_reset()
     
     def on_record_start(self):
         """Feedback when recording starts"""
-        log_event("🎙️  RECORDING STARTED")
-        self._sounds.play_record_start()
+        if self._is_repeat("record_start"):
+            return
+        log_event_bytes(_L_RECORDING_STARTED)
         self._lights.show_recording()
+        self._sounds.play_record_start()
     
     def on_record_saved(self):
         """Feedback when recording is saved"""
-        log_event("💾 RECORDING SAVED")
-        self._sounds.play_record_saved()
+        if self._is_repeat("record_saved"):
+            return
+        log_event_bytes(_L_RECORDING_SAVED)
         self._lights.show_success()
+        self._sounds.play_record_saved()
     
     def on_record_canceled(self):
         """Feedback when recording is canceled"""
-        log_event("❌ RECORDING CANCELED")
-        self._sounds.play_record_canceled()
+        if self._is_repeat("record_canceled"):
+            return
+        log_event_bytes(_L_RECORDING_CANCELED)
         self._lights.show_chip_loaded()
+        self._sounds.play_record_canceled()
     
     def on_blocked_action(self):
         """Feedback when action is blocked"""
-        log_event("🚫 ACTION BLOCKED")
-        self._sounds.play_blocked()
+        if self._is_repeat("blocked_action"):
+            return
+        log_event_bytes(_L_BLOCKED)
         self._lights.show_error()
+        self._sounds.play_blocked()
     
     def on_error(self):
         """Feedback for errors"""
-        log_event("❌ ERROR")
-        self._sounds.play_error()
+        if self._is_repeat("error"):
+            return
+        log_event_bytes(_L_ERROR)
         self._lights.show_error()
+        self._sounds.play_error()
     
     def on_volume_change(self, volume: int):
         """Feedback when volume changes
@@ -89,5 +146,7 @@ class UIController:
         Note: We don't play a sound here because that would interrupt music playback.
         Volume control works while music is playing via Mopidy's mixer API.
         """
+        if self._is_repeat(f"volume_change:{volume}"):
+            return
         log_event(f"🔊 VOLUME: {volume}")
         self._lights.show_volume(volume)
\ No newline at end of file
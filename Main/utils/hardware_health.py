@@ -8,6 +8,7 @@ and degradation detection for all hardware components.
 from enum import Enum
 from dataclasses import dataclass
 from typing import Dict, Optional, List
+import re
 import time
 import threading
 
@@ -58,6 +59,11 @@ class ComponentTracker:
         """
         self.name = name
         self._expected_errors = expected_errors or []
+        # All expected substrings as one compiled alternation (single C-level scan)
+        self._expected_re = (
+            re.compile("|".join(map(re.escape, self._expected_errors)))
+            if self._expected_errors else None
+        )
         self._log_interval = log_interval
         self._failure_threshold = failure_threshold
         self._degraded_threshold = degraded_threshold
@@ -67,25 +73,36 @@ class ComponentTracker:
         self._consecutive_errors = 0
         self._total_errors = 0
         self._last_error: Optional[str] = None
-        self._last_error_log_time = 0.0
+        self._last_error_log_time = float('-inf')  # time.monotonic() of last logged error
         self._last_success_time: Optional[float] = None
         self._failed_logged = False  # Track if we've logged the failure message
         
         self._lock = threading.Lock()
     
-    def _is_expected_error(self, error: Exception) -> bool:
-        """Check if error matches any expected error patterns"""
-        error_msg = str(error)
-        return any(expected in error_msg for expected in self._expected_errors)
+    def _is_expected_error(self, error_msg: str) -> bool:
+        """Check if an error message matches any expected error patterns"""
+        if self._expected_re is None:
+            return False
+        return self._expected_re.search(error_msg) is not None
     
-    def report_success(self):
+    def report_success(self, now: Optional[float] = None):
         """
         Report a successful operation.
         Resets error state and marks component as healthy.
+        
+        Args:
+            now: time.time() of the operation, if the caller already has it
         """
+        # Fast path (nearly every poll): nothing to reset, so skip the lock.
+        # Single attribute writes are atomic under the GIL.
+        if (self._consecutive_errors == 0 and not self._failed_logged
+                and self._status != ComponentStatus.DEGRADED):
+            self._last_success_time = now or time.time()
+            return
+        
         with self._lock:
             self._consecutive_errors = 0
-            self._last_success_time = time.time()
+            self._last_success_time = now or time.time()
             self._failed_logged = False
             
             # Only transition back to healthy if we were degraded
@@ -104,40 +121,47 @@ class ComponentTracker:
         Returns:
             True if the error should be logged (not suppressed/throttled)
         """
+        # Count and transition under the lock, so a report_success() racing
+        # with this can't be undone by a stale count (errors are the rare path)
+        error_msg = str(error)
         with self._lock:
             self._consecutive_errors += 1
             self._total_errors += 1
-            self._last_error = str(error)
+            self._last_error = error_msg
+            consecutive = self._consecutive_errors
             
             # Update status based on consecutive errors
-            if self._consecutive_errors >= self._failure_threshold:
-                if self._status != ComponentStatus.FAILED:
-                    self._status = ComponentStatus.FAILED
-            elif self._consecutive_errors >= self._degraded_threshold:
+            if consecutive >= self._failure_threshold:
+                self._status = ComponentStatus.FAILED
+            elif consecutive >= self._degraded_threshold:
                 if self._status == ComponentStatus.HEALTHY:
                     self._status = ComponentStatus.DEGRADED
-            
-            # Check if this is an expected error (suppress completely)
-            if self._is_expected_error(error):
-                return False
-            
-            # Rate-limit logging
-            current_time = time.time()
+        
+        # Check if this is an expected error (suppress completely)
+        if self._is_expected_error(error_msg):
+            return False
+        
+        # Rate-limit logging (monotonic: unaffected by NTP clock steps)
+        current_time = time.monotonic()
+        if current_time - self._last_error_log_time < self._log_interval:
+            return False
+        
+        with self._lock:
+            # Re-check so only one of several racing threads logs
             if current_time - self._last_error_log_time < self._log_interval:
                 return False
-            
             self._last_error_log_time = current_time
             return True
     
     def is_failed(self) -> bool:
         """Check if component is in failed state"""
-        with self._lock:
-            return self._status == ComponentStatus.FAILED
+        # Reading one attribute is atomic under the GIL - no lock needed
+        return self._status is ComponentStatus.FAILED
     
     def is_degraded(self) -> bool:
         """Check if component is degraded or failed"""
-        with self._lock:
-            return self._status in (ComponentStatus.DEGRADED, ComponentStatus.FAILED)
+        status = self._status
+        return status is ComponentStatus.DEGRADED or status is ComponentStatus.FAILED
     
     def log_failure_once(self, message: str):
         """
@@ -196,6 +220,7 @@ class HardwareHealthManager:
     
     def __init__(self):
         """Initialize the health manager"""
+        # Copy-on-write: register() publishes a new dict, readers never lock
         self._components: Dict[str, ComponentTracker] = {}
         self._components_lock = threading.Lock()
     
@@ -240,13 +265,14 @@ class HardwareHealthManager:
                 failure_threshold=failure_threshold,
                 degraded_threshold=degraded_threshold
             )
-            self._components[name] = tracker
+            components = dict(self._components)
+            components[name] = tracker
+            self._components = components  # Atomic publish
             return tracker
     
     def get_tracker(self, name: str) -> Optional[ComponentTracker]:
         """Get tracker for a component by name"""
-        with self._components_lock:
-            return self._components.get(name)
+        return self._components.get(name)
     
     def get_status(self, name: str) -> Optional[ComponentHealth]:
         """Get health status of a specific component"""
@@ -257,11 +283,11 @@ class HardwareHealthManager:
     
     def get_all_status(self) -> Dict[str, ComponentHealth]:
         """Get health status of all registered components"""
-        with self._components_lock:
-            return {
-                name: tracker.get_health()
-                for name, tracker in self._components.items()
-            }
+        components = self._components  # One consistent snapshot
+        return {
+            name: tracker.get_health()
+            for name, tracker in components.items()
+        }
     
     def reset_component(self, name: str) -> bool:
         """
@@ -278,6 +304,5 @@ class HardwareHealthManager:
     
     def reset_all(self):
         """Reset all components to healthy state"""
-        with self._components_lock:
-            for tracker in self._components.values():
-                tracker.reset()
+        for tracker in self._components.values():
+            tracker.reset()
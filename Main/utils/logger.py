@@ -2,61 +2,198 @@
 Timestamped logging utility for all actions
 """
 
-from datetime import datetime
+import atexit
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+
+# Lines are formatted and written by one background thread, so callers
+# (button/NFC polling threads) never block on a stdout write. Code that also
+# print()s directly must call flush() first to keep its output in order.
+# Items: (time, prefix, message), (time, None, pre-encoded tail) or a flush Event
+_log_queue = queue.SimpleQueue()
+
+# Bound once: the log_* helpers below are two C calls (clock read + queue put)
+_now = time.time
+_put = _log_queue.put
+_strftime = time.strftime
+_localtime = time.localtime
+
+# (second, formatted "%Y-%m-%d %H:%M:%S") of the last log line - one tuple so
+# threads always see a matching pair
+_last_second = (None, "")
+
+
+def _format_time(now: float) -> str:
+    """Format a time.time() value for log lines (date/time part formatted once per second)"""
+    global _last_second
+    second = int(now)
+    cached_second, prefix = _last_second
+    if second != cached_second:
+        prefix = _strftime("%Y-%m-%d %H:%M:%S", _localtime(second))
+        _last_second = (second, prefix)
+    return f"{prefix}.{int((now - second) * 1000):03d}"
+
+
+def _timestamp() -> str:
+    """Current time as used in log lines"""
+    return _format_time(_now())
+
+
+def _write(data: bytes):
+    """Write already-encoded log lines to stdout"""
+    out = sys.stdout
+    buffer = getattr(out, "buffer", None)
+    if buffer is None:
+        # Text-only stream (e.g. redirected to StringIO)
+        out.write(data.decode("utf-8"))
+        return
+    out.flush()  # Anything already print()ed to the text layer goes first
+    buffer.write(data)
+    buffer.flush()
+
+
+def _writer():
+    """Background thread - writes everything queued since the last pass in one go"""
+    while True:
+        batch = [_log_queue.get()]
+        while True:
+            try:
+                batch.append(_log_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        lines = []
+        flushed = []
+        for item in batch:
+            if isinstance(item, threading.Event):
+                flushed.append(item)
+                continue
+            now, prefix, message = item
+            if prefix is None:
+                lines.append(b"[" + _format_time(now).encode("ascii") + message)
+            else:
+                lines.append(f"[{_format_time(now)}{prefix}{message}\n".encode("utf-8"))
+        try:
+            if lines:
+                _write(b"".join(lines))
+        except Exception:
+            pass  # Nowhere left to report a broken stdout
+        for event in flushed:
+            event.set()
+
+
+def flush(timeout: float = 2.0):
+    """Block until every log line queued so far has been written"""
+    done = threading.Event()
+    _log_queue.put(done)
+    done.wait(timeout)
+
+
+def _flush_on_sigterm(signum, frame):
+    """Write out queued lines, then die from SIGTERM as if never caught"""
+    flush()
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    os.kill(os.getpid(), signal.SIGTERM)
+
+
+threading.Thread(target=_writer, name="log-writer", daemon=True).start()
+atexit.register(flush)
+# systemctl stop sends SIGTERM, which skips atexit - don't lose the shutdown
+# lines. Only if nobody handles SIGTERM yet (a later handler that exits
+# through sys.exit() flushes via atexit instead).
+if (threading.current_thread() is threading.main_thread()
+        and signal.getsignal(signal.SIGTERM) is signal.SIG_DFL):
+    signal.signal(signal.SIGTERM, _flush_on_sigterm)
+
+
+# "] [CATEGORY] " line prefixes, built once per category
+_prefixes = {}
+
+
+def _prefix(category: str) -> str:
+    """Line prefix for a category (everything between timestamp and message)"""
+    prefix = _prefixes.get(category)
+    if prefix is None:
+        prefix = _prefixes[category] = f"] [{category}] "
+    return prefix
 
 
 def log(message: str, category: str = "INFO"):
-    """Print a timestamped log message"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-    print(f"[{timestamp}] [{category}] {message}")
+    """Log a timestamped message (written asynchronously)"""
+    _put((_now(), _prefix(category), message))
+
+
+_ACTION = _prefix("ACTION")
+_STATE = _prefix("STATE")
+_EVENT = _prefix("EVENT")
+_SOUND = _prefix("SOUND") + "🔊 Playing: "
+_NFC = _prefix("NFC")
+_BUTTON = _prefix("BUTTON")
+_AUDIO = _prefix("AUDIO")
+_RECORD = _prefix("RECORD")
+_ERROR = _prefix("ERROR") + "❌ "
+_SUCCESS = _prefix("SUCCESS") + "✅ "
 
 
 def log_action(action: str):
     """Log a user action"""
-    log(action, "ACTION")
+    _put((_now(), _ACTION, action))
 
 
 def log_state(state: str):
     """Log a state change"""
-    log(state, "STATE")
+    _put((_now(), _STATE, state))
 
 
 def log_event(event: str):
     """Log an event"""
-    log(event, "EVENT")
+    _put((_now(), _EVENT, event))
+
+
+def encode_event(event: str) -> bytes:
+    """Pre-encode a fixed event message for log_event_bytes()"""
+    return f"{_EVENT}{event}\n".encode("utf-8")
+
+
+def log_event_bytes(line: bytes):
+    """Log an event pre-encoded by encode_event() (no per-call formatting/encoding)"""
+    _put((_now(), None, line))
 
 
 def log_sound(sound: str):
     """Log sound playback"""
-    log(f"🔊 Playing: {sound}", "SOUND")
+    _put((_now(), _SOUND, sound))
 
 
 def log_nfc(message: str):
     """Log NFC events"""
-    log(message, "NFC")
+    _put((_now(), _NFC, message))
 
 
 def log_button(message: str):
     """Log button events"""
-    log(message, "BUTTON")
+    _put((_now(), _BUTTON, message))
 
 
 def log_audio(message: str):
     """Log audio player events"""
-    log(message, "AUDIO")
+    _put((_now(), _AUDIO, message))
 
 
 def log_recording(message: str):
     """Log recording events"""
-    log(message, "RECORD")
+    _put((_now(), _RECORD, message))
 
 
 def log_error(message: str):
     """Log errors"""
-    log(f"❌ {message}", "ERROR")
+    _put((_now(), _ERROR, message))
 
 
 def log_success(message: str):
     """Log success"""
-    log(f"✅ {message}", "SUCCESS")
-
+    _put((_now(), _SUCCESS, message))
@@ -9,22 +9,82 @@ All data fetching goes through HTTP to ensure the server is the single
 source of truth for all configuration and chip data.
 """
 
-import json
-import urllib.request
-import urllib.error
-from typing import Optional, Dict, Any, List
+import http.client
+import socket
+import threading
+from urllib.parse import quote
+from typing import Optional, Dict, Any, List, Tuple
 
 from config.settings import SERVER_HOST, SERVER_PORT
 from utils.logger import log_error, log
 
+try:
+    import orjson  # Optional: much faster parsing of /chips and /library (pip install orjson)
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    import json
+    _loads = json.loads
+    
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
 
 # Server configuration
 SERVER_BASE_URL = f'http://{SERVER_HOST}:{SERVER_PORT}'
 
+# One keep-alive connection to the local server, shared by all callers
+_conn: Optional[http.client.HTTPConnection] = None
+_conn_lock = threading.Lock()
+
+# endpoint -> [done Event, result] for GETs currently in flight (single-flight)
+_inflight: Dict[str, list] = {}
+_inflight_lock = threading.Lock()
+
+# Raised when a kept-alive connection turns out to have been closed by the server
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                            ConnectionResetError, BrokenPipeError)
+
+
+def _request(method: str, endpoint: str, body: Optional[bytes] = None,
+             timeout: int = 5) -> Tuple[int, str, bytes]:
+    """Send a request over the shared connection (reconnecting if needed).
+    
+    Returns:
+        (status, reason, response body)
+    """
+    global _conn
+    headers = {'Content-Type': 'application/json'} if body is not None else {}
+    with _conn_lock:
+        while True:
+            reused = _conn is not None and _conn.sock is not None
+            if _conn is None:
+                _conn = http.client.HTTPConnection(SERVER_HOST, SERVER_PORT, timeout=timeout)
+            _conn.timeout = timeout
+            if _conn.sock is not None:
+                _conn.sock.settimeout(timeout)
+            try:
+                _conn.request(method, endpoint, body=body, headers=headers)
+                response = _conn.getresponse()
+                return response.status, response.reason, response.read()
+            except _STALE_CONNECTION_ERRORS:
+                _conn.close()
+                _conn = None
+                if not reused:
+                    raise
+                # Server dropped the idle connection - retry once on a fresh one
+            except Exception:
+                _conn.close()
+                _conn = None
+                raise
+
 
 def _http_get(endpoint: str, timeout: int = 5) -> Optional[Any]:
     """Make HTTP GET request to local server.
     
+    Concurrent GETs of the same endpoint share one request: later callers
+    wait for the one in flight and get its result.
+    
     Args:
         endpoint: API endpoint (e.g., '/parental')
         timeout: Request timeout in seconds
@@ -32,18 +92,45 @@ def _http_get(endpoint: str, timeout: int = 5) -> Optional[Any]:
     Returns:
         Parsed JSON response, or None on error
     """
+    with _inflight_lock:
+        call = _inflight.get(endpoint)
+        leader = call is None
+        if leader:
+            call = _inflight[endpoint] = [threading.Event(), None]
+    
+    if not leader:
+        call[0].wait()
+        return call[1]
+    
     try:
-        url = f'{SERVER_BASE_URL}{endpoint}'
-        req = urllib.request.Request(url, method='GET')
-        with urllib.request.urlopen(req, timeout=timeout) as response:
-            return json.loads(response.read().decode('utf-8'))
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
+        call[1] = _fetch_json(endpoint, timeout)
+    finally:
+        with _inflight_lock:
+            del _inflight[endpoint]
+        call[0].set()
+    return call[1]
+
+
+def _fetch_json(endpoint: str, timeout: int = 5) -> Optional[Any]:
+    """Do a GET request and parse the JSON body.
+    
+    Args:
+        endpoint: API endpoint (e.g., '/parental')
+        timeout: Request timeout in seconds
+        
+    Returns:
+        Parsed JSON response, or None on error
+    """
+    try:
+        status, reason, body = _request('GET', endpoint, timeout=timeout)
+        if status == 404:
             return None
-        log_error(f"HTTP GET {endpoint} error: {e.code} {e.reason}")
-        return None
-    except urllib.error.URLError as e:
-        log_error(f"HTTP GET {endpoint} connection error: {e.reason}")
+        if status >= 400:
+            log_error(f"HTTP GET {endpoint} error: {status} {reason}")
+            return None
+        return _loads(body)
+    except OSError as e:
+        log_error(f"HTTP GET {endpoint} connection error: {e}")
         return None
     except Exception as e:
         log_error(f"HTTP GET {endpoint} failed: {e}")
@@ -62,16 +149,12 @@ def _http_post(endpoint: str, data: Dict, timeout: int = 5) -> Optional[Any]:
         Parsed JSON response, or None on error
     """
     try:
-        url = f'{SERVER_BASE_URL}{endpoint}'
-        json_data = json.dumps(data).encode('utf-8')
-        req = urllib.request.Request(
-            url,
-            data=json_data,
-            method='POST',
-            headers={'Content-Type': 'application/json'}
-        )
-        with urllib.request.urlopen(req, timeout=timeout) as response:
-            return json.loads(response.read().decode('utf-8'))
+        json_data = _dumps(data)
+        status, reason, body = _request('POST', endpoint, body=json_data, timeout=timeout)
+        if status >= 400:
+            log_error(f"HTTP POST {endpoint} failed: HTTP Error {status}: {reason}")
+            return None
+        return _loads(body)
     except Exception as e:
         log_error(f"HTTP POST {endpoint} failed: {e}")
         return None
@@ -152,33 +235,16 @@ def get_chips() -> List[Dict[str, Any]]:
 def get_chip_by_uid(uid: str) -> Optional[Dict[str, Any]]:
     """Fetch chip data by UID from server.
     
+    The server joins chip and library itself, so this is one request
+    returning one small record.
+    
     Args:
         uid: NFC chip UID
         
     Returns:
         Chip dict with resolved URI, or None if not found
     """
-    chips = get_chips()
-    for chip in chips:
-        if chip.get('uid') == uid:
-            # Resolve URI from library if chip has song_id
-            uri = ''
-            song_id = chip.get('song_id')
-            if song_id:
-                library = get_library()
-                for song in library:
-                    if song.get('id') == song_id:
-                        uri = song.get('uri', '')
-                        break
-            
-            return {
-                'uid': uid,
-                'name': chip.get('name', 'Unknown'),
-                'uri': uri,
-                'song_id': song_id,
-                'song_name': chip.get('song_name', ''),
-            }
-    return None
+    return _http_get(f'/chips/uid/{quote(uid, safe="")}')
 
 
 # =============================================================================
@@ -208,14 +274,17 @@ def get_status() -> Optional[Dict[str, Any]]:
     return _http_get('/status')
 
 
-def check_server_health() -> bool:
-    """Check if server is reachable and healthy.
+def check_server_health(timeout: float = 0.2) -> bool:
+    """Check if server is reachable.
+    
+    Only opens a TCP connection to the server port (no HTTP request or
+    JSON), so it is cheap and fails fast while the server is starting.
     
     Returns:
-        True if server responds, False otherwise
+        True if server accepts connections, False otherwise
     """
     try:
-        status = get_status()
-        return status is not None
-    except Exception:
+        with socket.create_connection((SERVER_HOST, SERVER_PORT), timeout=timeout):
+            return True
+    except OSError:
         return False
@@ -12,8 +12,8 @@ import sys
 import time
 import subprocess
 import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs, parse_qsl, urlparse
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -21,8 +21,17 @@ from hardware.wifi_manager import (
     WiFiManager, AP_SSID, AP_IP, WEB_PORT,
     render_network_list_html, render_status_html
 )
+from utils.logger import log
 
 CONNECT_TIMEOUT = 30  # Seconds to wait for auto-connect
+MAX_FORM_BYTES = 4096  # The connect form is just ssid + password
+
+# Connectivity-check URLs phones/laptops fetch to detect a captive portal
+CAPTIVE_PROBE_PATHS = frozenset((
+    '/generate_204', '/gen_204',                           # Android / Chrome
+    '/hotspot-detect.html', '/library/test/success.html',  # Apple
+    '/connecttest.txt', '/ncsi.txt',                       # Windows
+))
 
 
 class LEDController:
@@ -37,7 +46,11 @@ class LEDController:
             self._enabled = True
         except Exception:
             self._enabled = False
-        self._pulsing = False
+        # One long-lived pulse thread; _pulse()/stop_pulse() just change its color
+        self._pulse_color = None
+        self._pulse_cond = threading.Condition()
+        if self._enabled:
+            threading.Thread(target=self._pulse_loop, daemon=True).start()
     
     def ap_mode(self):
         """AP mode - blue pulsing"""
@@ -66,46 +79,85 @@ class LEDController:
                 time.sleep(0.2)
     
     def _pulse(self, color):
-        """Start pulsing LED with given color"""
-        self.stop_pulse()
-        self._pulsing = True
-        def do_pulse():
-            while self._pulsing:
-                self.leds.set_light(self.LIGHT, color)
-                time.sleep(0.5)
-                self.leds.off(self.LIGHT)
-                time.sleep(0.5)
-        threading.Thread(target=do_pulse, daemon=True).start()
+        """Start pulsing LED with given color (PCF8574 has no hardware blink)"""
+        with self._pulse_cond:
+            self._pulse_color = color
+            self._pulse_cond.notify()
     
     def stop_pulse(self):
-        """Stop pulsing"""
-        self._pulsing = False
-        time.sleep(0.1)
+        """Stop pulsing (returns once the pulse thread has stopped writing)"""
+        with self._pulse_cond:
+            self._pulse_color = None
+            self._pulse_cond.notify()
+    
+    def _pulse_loop(self):
+        """Pulse thread body - LED writes happen under the condition's lock
+        and only while a color is set, so nothing is written after stop_pulse()"""
+        with self._pulse_cond:
+            while True:
+                while self._pulse_color is None:
+                    self._pulse_cond.wait()
+                color = self._pulse_color
+                self.leds.set_light(self.LIGHT, color)
+                self._pulse_cond.wait(0.5)
+                if self._pulse_color is not color:
+                    continue  # Stopped or switched color - don't blank the LED
+                self.leds.off(self.LIGHT)
+                self._pulse_cond.wait(0.5)
 
 
 class CaptivePortalHandler(BaseHTTPRequestHandler):
     """HTTP handler for captive portal - uses shared WiFiManager and HTML templates"""
     
+    # Buffer the response so headers and page go out in one send() instead
+    # of one per write (flushed by handle_one_request after each request)
+    wbufsize = 8192
+    
     def log_message(self, format, *args):
         """Log requests for debugging"""
-        print(f"[HTTP] WIFI-PROVISIONER: {self.address_string()} - {format % args}")
+        log(f"WIFI-PROVISIONER: {self.address_string()} - {format % args}", "HTTP")
     
     def do_GET(self):
-        """Handle GET requests - show network list"""
-        networks = WiFiManager.scan_networks()
+        """Handle GET requests - show network list (?rescan=1 forces a fresh scan)"""
+        url = urlparse(self.path)
+        if url.path in CAPTIVE_PROBE_PATHS:
+            # Answer probes straight away with a redirect (no scan) - any
+            # non-expected reply makes the OS show its "sign in" prompt
+            self.send_response(302)
+            self.send_header('Location', f"http://{AP_IP}:{WEB_PORT}/")
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        
+        query = parse_qs(url.query)
+        networks = WiFiManager.scan_networks(force=query.get('rescan') == ['1'])
         html = render_network_list_html(networks, connect_action="/connect")
         
         self.send_response(200)
         self.send_header('Content-type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(html)))
         self.end_headers()
-        self.wfile.write(html.encode('utf-8'))
+        self.wfile.write(html)
     
     def do_POST(self):
         """Handle POST requests - connect to network"""
-        length = int(self.headers['Content-Length'])
-        data = parse_qs(self.rfile.read(length).decode())
-        ssid = data.get('ssid', [''])[0]
-        password = data.get('password', [''])[0]
+        # Anyone on the AP can post here - refuse bodies bigger than the form
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            self.send_error(400)
+            return
+        if length > MAX_FORM_BYTES:
+            self.send_error(413)
+            return
+        raw = self.rfile.read(length).decode('utf-8', 'replace')
+        try:
+            fields = dict(parse_qsl(raw, max_num_fields=8))
+        except ValueError:
+            self.send_error(400)
+            return
+        ssid = fields.get('ssid', '')
+        password = fields.get('password', '')
         
         if self.server.led:
             self.server.led.connecting()
@@ -126,8 +178,9 @@ class CaptivePortalHandler(BaseHTTPRequestHandler):
         html = render_status_html(success, ssid, connect_action="/connect")
         self.send_response(200)
         self.send_header('Content-type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(html)))
         self.end_headers()
-        self.wfile.write(html.encode('utf-8'))
+        self.wfile.write(html)
 
 
 class WiFiProvisioner:
@@ -138,30 +191,29 @@ class WiFiProvisioner:
     
     def run(self):
         """Main provisioning flow - wait for WiFi, fallback to AP mode"""
-        print("[WiFi] Waiting for NetworkManager to connect...")
+        log("Waiting for NetworkManager to connect...", "WiFi")
         self.led.connecting()
         
         # Give NetworkManager time to auto-connect to known networks
-        for i in range(CONNECT_TIMEOUT):
-            if WiFiManager.is_connected():
-                ssid = WiFiManager.get_current_ssid()
-                print(f"[WiFi] Connected to {ssid}")
-                self.led.connected()
-                return  # Exit - normal operation can proceed
-            time.sleep(1)
-            if i % 5 == 0:
-                print(f"[WiFi] Waiting... ({CONNECT_TIMEOUT - i}s remaining)")
+        log(f"Waiting up to {CONNECT_TIMEOUT}s...", "WiFi")
+        if WiFiManager.wait_for_connection(CONNECT_TIMEOUT):
+            ssid = WiFiManager.get_current_ssid()
+            log(f"Connected to {ssid}", "WiFi")
+            self.led.connected()
+            return  # Exit - normal operation can proceed
         
         # No connection after timeout - start AP mode
-        print("[WiFi] No connection, starting AP mode...")
+        log("No connection, starting AP mode...", "WiFi")
         self.led.ap_mode()
         WiFiManager.start_ap()
         
         # Start captive portal
-        server = HTTPServer(('0.0.0.0', WEB_PORT), CaptivePortalHandler)
+        # Threaded so a phone's parallel probe/keep-alive sockets can't stall the form submit
+        server = ThreadingHTTPServer(('0.0.0.0', WEB_PORT), CaptivePortalHandler)
+        server.daemon_threads = True  # Don't let in-flight sockets hold up the reboot
         server.led = self.led
-        print(f"[WiFi] Captive portal running at http://{AP_IP}:{WEB_PORT}")
-        print(f"[WiFi] Connect to '{AP_SSID}' WiFi to configure")
+        log(f"Captive portal running at http://{AP_IP}:{WEB_PORT}", "WiFi")
+        log(f"Connect to '{AP_SSID}' WiFi to configure", "WiFi")
         server.serve_forever()
 
 
@@ -1,22 +1,13 @@
 import RPi.GPIO as GPIO
-import time
 
 BUTTON = 17
 
 GPIO.setmode(GPIO.BCM)
-GPIO.setup(BUTTON, GPIO.IN)
+GPIO.setup(BUTTON, GPIO.IN, pull_up_down=GPIO.PUD_UP)
 
-was_on = False
 print("press the button!")
-i = 0
-while True:
-    state = GPIO.input(BUTTON)
-    if not state:
-        print("the button was pressed. good bye.")
-        break
-    elif i > 40:
-        print("i aint got all day. good bye")
-        break
-
-    time.sleep(0.25)
-    i = i + 1
+# Already held down, or block in the kernel until the falling edge (10s max)
+if not GPIO.input(BUTTON) or GPIO.wait_for_edge(BUTTON, GPIO.FALLING, timeout=10000) is not None:
+    print("the button was pressed. good bye.")
+else:
+    print("i aint got all day. good bye")
@@ -1,10 +1,13 @@
 from smbus2 import SMBus
+import signal
 import time
 
 bus = SMBus(1)
 ADDR = 0x20  # PCF8574
+INT_PIN = None  # BCM pin wired to the PCF8574 INT output (None = not wired, poll)
 
-while True:
+
+def read_and_print(channel=None):
     value = bus.read_byte(ADDR)
     p0 = value & 0b00000001  # read bit 0
 
@@ -13,4 +16,16 @@ while True:
     else:
         print("Button not pressed")
 
-    time.sleep(0.2)
+
+if INT_PIN is not None:
+    # INT pulls low whenever an input changes - only touch the I2C bus then
+    import RPi.GPIO as GPIO
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setup(INT_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+    read_and_print()
+    GPIO.add_event_detect(INT_PIN, GPIO.FALLING, callback=read_and_print)
+    signal.pause()
+else:
+    while True:
+        read_and_print()
+        time.sleep(0.2)
@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 from smbus2 import SMBus
-import subprocess
 import sys
 
 I2C_BUS_ID = 1
@@ -11,21 +10,24 @@ I2C_DEVICES = {
 }
 
 def check_i2c_device(bus, addr):
+    # SMBus quick write: just the address + ACK, no data byte read, so
+    # probing can't disturb chips like the PN532
     try:
-        bus.read_byte(addr)
+        bus.write_quick(addr)
         return True
     except OSError:
         return False
 
 def check_respeaker_alsa():
+    # Same card names aplay -l prints, read straight from the kernel
     try:
-        out = subprocess.check_output(["aplay", "-l"], text=True)
-    except Exception:
+        with open("/proc/asound/cards", "rb") as f:
+            text = f.read().lower()
+    except OSError:
         return False
 
     # ReSpeaker usually shows as seeed / voicecard / respeaker
-    text = out.lower()
-    return any(k in text for k in ["seeed", "voicecard", "respeaker"])
+    return any(k in text for k in (b"seeed", b"voicecard", b"respeaker"))
 
 def main():
     ok = True
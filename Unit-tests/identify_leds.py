@@ -4,13 +4,18 @@ Simple LED Identification Script
 Turns each LED red one at a time so you can identify which is which.
 """
 
-from smbus2 import SMBus
+from smbus2 import SMBus, i2c_msg
 import time
 
 I2C_BUS = 1
 LED_EXPANDER = 0x21      # Main LED expander
 BUTTON_EXPANDER = 0x20   # Button expander (has divided LED pin)
 
+def write_both(bus, led_value, btn_value):
+    """Set both expanders in one I2C transfer so they change together"""
+    bus.i2c_rdwr(i2c_msg.write(LED_EXPANDER, [led_value]),
+                 i2c_msg.write(BUTTON_EXPANDER, [btn_value]))
+
 def main():
     bus = SMBus(I2C_BUS)
     
@@ -69,9 +74,8 @@ def main():
     print()
     
     input("Press Enter to test P6 on BUTTON expander (0x20)...")
-    bus.write_byte(LED_EXPANDER, 0x00)  # Clear LED expander
     btn_state = (btn_state & 0x3F) | 0b01000000  # Set P6
-    bus.write_byte(BUTTON_EXPANDER, btn_state)
+    write_both(bus, 0x00, btn_state)  # ...and clear LED expander
     print(">>> P6 (0x20) ON - What color/LED?")
     print()
     
@@ -85,8 +89,7 @@ def main():
     # Cleanup
     # -------------------------------------------------------------------------
     input("Press Enter to turn all OFF and exit...")
-    bus.write_byte(LED_EXPANDER, 0x00)
-    bus.write_byte(BUTTON_EXPANDER, 0x3F)  # Restore button inputs
+    write_both(bus, 0x00, 0x3F)  # All off, restore button inputs
     bus.close()
     
     print()
@@ -25,6 +25,11 @@ import board
 import busio
 from adafruit_pn532.i2c import PN532_I2C
 
+try:
+    import orjson  # Optional: C-level JSON encoding (pip install orjson)
+except ImportError:
+    orjson = None
+
 CONFIG_PATH = "tags.json"
 PN532_I2C_ADDRESS = 0x24
 
@@ -45,11 +50,10 @@ def read_uid_blocking(pn532):
     Block until a tag is present and return its UID (as bytes).
     """
     while True:
-        uid = pn532.read_passive_target(timeout=0.5)
+        # Waits inside the PN532, so no extra sleep is needed between tries
+        uid = pn532.read_passive_target(timeout=1.0)
         if uid is not None:
             return uid
-        # small sleep to avoid busy loop
-        time.sleep(0.1)
 
 
 def uid_to_str(uid):
@@ -74,8 +78,17 @@ def load_config(path=CONFIG_PATH):
 
 
 def save_config(config, path=CONFIG_PATH):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(config, f, indent=2, ensure_ascii=False)
+    # Kept as one JSON object (server.py migrates chips from this format).
+    # Written to a temp file and renamed so a crash mid-save can't leave
+    # a truncated tags.json behind.
+    if orjson is not None:
+        data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(config, indent=2, ensure_ascii=False).encode("utf-8")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
 
 
 # ---------- MAIN LOOP ----------
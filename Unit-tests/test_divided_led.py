@@ -10,8 +10,8 @@ two I2C expanders:
 Run this test and observe which color lights up for each pin.
 """
 
-from smbus2 import SMBus
-import time
+from smbus2 import SMBus, i2c_msg
+import asyncio
 import sys
 
 # I2C Configuration
@@ -22,6 +22,18 @@ BUTTON_EXPANDER_ADDRESS = 0x20  # Button expander
 # Candidate pins for the new divided LED
 LED_EXPANDER_PINS = [6, 7]     # P6, P7 on 0x21
 BUTTON_EXPANDER_PINS = [6, 7]  # P6, P7 on 0x20
+LED_TEST_MASK = sum(1 << pin for pin in LED_EXPANDER_PINS)
+BUTTON_TEST_MASK = sum(1 << pin for pin in BUTTON_EXPANDER_PINS)
+
+# Per-pin set / clear masks, computed once
+_BIT = tuple(1 << i for i in range(8))
+_NBIT = tuple(~(1 << i) & 0xFF for i in range(8))
+
+# Every (address, pin) under test, in menu order
+TEST_PINS = (
+    [(LED_EXPANDER_ADDRESS, pin) for pin in LED_EXPANDER_PINS]
+    + [(BUTTON_EXPANDER_ADDRESS, pin) for pin in BUTTON_EXPANDER_PINS]
+)
 
 
 class DividedLedTester:
@@ -30,45 +42,55 @@ class DividedLedTester:
     def __init__(self):
         self.bus = SMBus(I2C_BUS)
         
-        # Read current states to preserve existing LED states
+        # Read the LED expander once to preserve the other LEDs' states
+        # (test pins start off)
         try:
-            self.led_state = self.bus.read_byte(LED_EXPANDER_ADDRESS)
+            self.led_state = self.bus.read_byte(LED_EXPANDER_ADDRESS) & ~LED_TEST_MASK
         except:
             self.led_state = 0x00
-            
-        try:
-            # Button expander needs high bits for input (buttons are active-low)
-            # We only want to modify P6/P7, keep P0-P5 high for button inputs
-            self.button_state = self.bus.read_byte(BUTTON_EXPANDER_ADDRESS)
-        except:
-            self.button_state = 0x3F  # P0-P5 high (for buttons), P6-P7 low
+        
+        # Button expander is NOT read back: P0-P5 are active-low button inputs
+        # and must always be written high, so its state is known up front
+        # (reading it while a button is held would latch that pin low).
+        # Only P6/P7 are modified.
+        self.button_state = 0x3F  # P0-P5 high (for buttons), P6-P7 low
     
     def set_pin(self, address: int, pin: int, on: bool):
         """Set a single pin on/off"""
         if address == LED_EXPANDER_ADDRESS:
-            if on:
-                self.led_state |= (1 << pin)
-            else:
-                self.led_state &= ~(1 << pin)
-            self.bus.write_byte(address, self.led_state)
+            state = self.led_state
+            self.led_state = state = (state | _BIT[pin]) if on else (state & _NBIT[pin])
         else:  # Button expander
-            if on:
-                self.button_state |= (1 << pin)
+            state = self.button_state
+            self.button_state = state = (state | _BIT[pin]) if on else (state & _NBIT[pin])
+        self.bus.write_byte(address, state)
+    
+    def show_pins(self, pins):
+        """Turn on exactly the given (address, pin) test pins, all other test
+        pins off - both expanders in one I2C transfer however many pins change"""
+        led_state = self.led_state & ~LED_TEST_MASK
+        button_state = self.button_state & ~BUTTON_TEST_MASK
+        for address, pin in pins:
+            if address == LED_EXPANDER_ADDRESS:
+                led_state |= _BIT[pin]
             else:
-                self.button_state &= ~(1 << pin)
-            self.bus.write_byte(address, self.button_state)
+                button_state |= _BIT[pin]
+        self.led_state = led_state
+        self.button_state = button_state
+        self._write_both()
+    
+    def _write_both(self):
+        """Write both expander states in a single i2c_rdwr (one ioctl)"""
+        self.bus.i2c_rdwr(i2c_msg.write(LED_EXPANDER_ADDRESS, [self.led_state]),
+                          i2c_msg.write(BUTTON_EXPANDER_ADDRESS, [self.button_state]))
     
     def clear_all_test_pins(self):
         """Turn off all test pins (P6, P7 on both expanders)"""
-        for pin in LED_EXPANDER_PINS:
-            self.set_pin(LED_EXPANDER_ADDRESS, pin, False)
-        for pin in BUTTON_EXPANDER_PINS:
-            self.set_pin(BUTTON_EXPANDER_ADDRESS, pin, False)
+        self.show_pins(())
     
     def test_single_pin(self, address: int, pin: int):
         """Turn on a single pin for testing"""
-        self.clear_all_test_pins()
-        self.set_pin(address, pin, True)
+        self.show_pins(((address, pin),))
     
     def close(self):
         """Clean up"""
@@ -84,19 +106,60 @@ def get_pin_description(address, pin):
         return f"Button Expander (0x20) P{pin}"
 
 
+async def cycle_pins(tester, pins, dwell, on_pin=None):
+    """
+    Light each pin in turn for dwell seconds.
+    
+    Waits with asyncio.sleep, so it can run alongside other tasks
+    (status polling, button handling) on the same event loop.
+    
+    Args:
+        tester: DividedLedTester
+        pins: (address, pin) pairs
+        dwell: Seconds each pin stays lit
+        on_pin: Optional callback(address, pin), called as each pin lights
+    """
+    for addr, pin in pins:
+        if on_pin is not None:
+            on_pin(addr, pin)
+        tester.test_single_pin(addr, pin)
+        await asyncio.sleep(dwell)
+    tester.clear_all_test_pins()
+
+
+# Menu text never changes - rendered once at import
+_PIN_LIST = "".join(f"  {i}. {get_pin_description(addr, pin)}\n"
+                    for i, (addr, pin) in enumerate(TEST_PINS, 1))
+_INTRO = (
+    "=" * 50 + "\n"
+    "Divided LED Pin Identification Test\n"
+    + "=" * 50 + "\n"
+    "\n"
+    "This test will light up individual pins to help\n"
+    "identify which is R, G, and B on the new LED.\n"
+    "\n"
+    "Candidate pins:\n"
+    "  - LED Expander (0x21): P6, P7\n"
+    "  - Button Expander (0x20): P6, P7\n"
+    "\n"
+)
+_MAIN_MENU = (
+    "\n" + "=" * 50 + "\n"
+    "Select a pin to test:\n"
+    + "=" * 50 + "\n"
+    + _PIN_LIST
+    + "\n"
+    "  a. Auto-cycle through all pins (2s each)\n"
+    "  c. Combination test (light 2 or 3 pins together)\n"
+    "  0. Turn all test pins OFF\n"
+    "  q. Quit\n"
+)
+_COMBINATION_MENU = "\nAvailable pins:\n" + _PIN_LIST
+
+
 def interactive_test():
     """Interactive pin-by-pin testing"""
-    print("=" * 50)
-    print("Divided LED Pin Identification Test")
-    print("=" * 50)
-    print()
-    print("This test will light up individual pins to help")
-    print("identify which is R, G, and B on the new LED.")
-    print()
-    print("Candidate pins:")
-    print("  - LED Expander (0x21): P6, P7")
-    print("  - Button Expander (0x20): P6, P7")
-    print()
+    sys.stdout.write(_INTRO)
     
     try:
         tester = DividedLedTester()
@@ -109,27 +172,13 @@ def interactive_test():
         print("  3. Run: i2cdetect -y 1")
         sys.exit(1)
     
-    # Build list of all test pins
-    test_pins = []
-    for pin in LED_EXPANDER_PINS:
-        test_pins.append((LED_EXPANDER_ADDRESS, pin))
-    for pin in BUTTON_EXPANDER_PINS:
-        test_pins.append((BUTTON_EXPANDER_ADDRESS, pin))
+    test_pins = TEST_PINS
     
     try:
         while True:
-            print("\n" + "=" * 50)
-            print("Select a pin to test:")
-            print("=" * 50)
-            
-            for i, (addr, pin) in enumerate(test_pins, 1):
-                print(f"  {i}. {get_pin_description(addr, pin)}")
-            
-            print()
-            print("  a. Auto-cycle through all pins (2s each)")
-            print("  c. Combination test (light 2 or 3 pins together)")
-            print("  0. Turn all test pins OFF")
-            print("  q. Quit")
+            # Whole menu in one write instead of a print() per line
+            sys.stdout.write(_MAIN_MENU)
+            sys.stdout.flush()
             
             choice = input("\nEnter choice: ").strip().lower()
             
@@ -144,12 +193,9 @@ def interactive_test():
             if choice == 'a':
                 print("\nAuto-cycling through all pins (press Ctrl+C to stop)...")
                 try:
-                    for addr, pin in test_pins:
-                        desc = get_pin_description(addr, pin)
-                        print(f"  Testing: {desc}")
-                        tester.test_single_pin(addr, pin)
-                        time.sleep(2)
-                    tester.clear_all_test_pins()
+                    asyncio.run(cycle_pins(
+                        tester, test_pins, 2,
+                        lambda addr, pin: print(f"  Testing: {get_pin_description(addr, pin)}")))
                     print("Auto-cycle complete")
                 except KeyboardInterrupt:
                     tester.clear_all_test_pins()
@@ -192,9 +238,8 @@ def combination_test(tester, test_pins):
     print("Press Enter with no input to go back")
     
     while True:
-        print("\nAvailable pins:")
-        for i, (addr, pin) in enumerate(test_pins, 1):
-            print(f"  {i}. {get_pin_description(addr, pin)}")
+        sys.stdout.write(_COMBINATION_MENU)
+        sys.stdout.flush()
         
         choice = input("\nPins to light (e.g., '1 2 3'): ").strip()
         
@@ -204,14 +249,8 @@ def combination_test(tester, test_pins):
         try:
             indices = [int(x) - 1 for x in choice.split()]
             
-            # Clear first
-            tester.clear_all_test_pins()
-            
-            # Light selected pins
-            for idx in indices:
-                if 0 <= idx < len(test_pins):
-                    addr, pin = test_pins[idx]
-                    tester.set_pin(addr, pin, True)
+            # Light selected pins (everything else off)
+            tester.show_pins([test_pins[idx] for idx in indices if 0 <= idx < len(test_pins)])
             
             print("\nLighting pins:", end=" ")
             for idx in indices:
@@ -236,22 +275,13 @@ def quick_scan():
         print(f"Error: {e}")
         sys.exit(1)
     
-    test_pins = [
-        (LED_EXPANDER_ADDRESS, 6),
-        (LED_EXPANDER_ADDRESS, 7),
-        (BUTTON_EXPANDER_ADDRESS, 6),
-        (BUTTON_EXPANDER_ADDRESS, 7),
-    ]
+    def announce(addr, pin):
+        print(f"\nTesting: {get_pin_description(addr, pin)}")
+        print("  What color do you see?")
     
     try:
-        for addr, pin in test_pins:
-            desc = get_pin_description(addr, pin)
-            print(f"\nTesting: {desc}")
-            print("  What color do you see?")
-            tester.test_single_pin(addr, pin)
-            time.sleep(3)
+        asyncio.run(cycle_pins(tester, TEST_PINS, 3, announce))
         
-        tester.clear_all_test_pins()
         print("\n" + "=" * 50)
         print("Scan complete! Based on colors observed:")
         print("  - Note which pin showed RED")
@@ -1,18 +1,94 @@
-import board
-import busio
-from adafruit_pn532.i2c import PN532_I2C
+import sys
+import time
 
-# Create I2C object on Pi I2C bus 1
-i2c = busio.I2C(board.SCL, board.SDA)
+from smbus2 import SMBus
 
 # Your device address:
 PN532_ADDR = 0x24
+I2C_BUS = 1
 
-pn532 = PN532_I2C(i2c, address=PN532_ADDR, debug=False)
+# Firmware version of the last successful check, valid until the next boot.
+# Pass --refresh to always talk to the chip.
+FW_CACHE_FILE = "/tmp/pn532_fw"
+BOOT_ID_FILE = "/proc/sys/kernel/random/boot_id"
 
-# Wake up and configure SAM (required)
-pn532.SAM_configuration()
 
-fw = pn532.firmware_version
-print("Found PN532 with firmware version:", fw)
+def pn532_present():
+    """Cheap presence probe (address-only quick write) before loading the PN532 driver"""
+    with SMBus(I2C_BUS) as bus:
+        for _ in range(2):  # A sleeping PN532 may NACK the first access while it wakes
+            try:
+                # Quick write, as health_check.py does - no data byte, so the
+                # probe can't disturb the PN532's frame handling like a read
+                bus.write_quick(PN532_ADDR)
+                return True
+            except OSError:
+                time.sleep(0.01)
+    return False
 
+
+def read_boot_id():
+    try:
+        with open(BOOT_ID_FILE) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def load_cached_fw(boot_id):
+    """Firmware version cached during this boot, or None"""
+    if boot_id is None:
+        return None
+    try:
+        with open(FW_CACHE_FILE) as f:
+            cached_boot_id, fw = f.read().split("\n", 1)
+    except (OSError, ValueError):
+        return None
+    return fw.strip() if cached_boot_id == boot_id else None
+
+
+def save_cached_fw(boot_id, fw):
+    if boot_id is None:
+        return
+    try:
+        with open(FW_CACHE_FILE, "w") as f:
+            f.write(f"{boot_id}\n{fw}\n")
+    except OSError:
+        pass
+
+
+def read_fw():
+    """Wake the PN532 and read its firmware version over the full driver"""
+    import board
+    import busio
+    from adafruit_pn532.i2c import PN532_I2C
+
+    # Create I2C object on Pi I2C bus 1
+    i2c = busio.I2C(board.SCL, board.SDA)
+    pn532 = PN532_I2C(i2c, address=PN532_ADDR, debug=False)
+
+    # Wake up and configure SAM (required)
+    pn532.SAM_configuration()
+
+    return pn532.firmware_version
+
+
+def main():
+    if not pn532_present():
+        print(f"No PN532 found at 0x{PN532_ADDR:02X} (check wiring / i2cdetect -y {I2C_BUS})")
+        return 1
+
+    boot_id = read_boot_id()
+    fw = None if "--refresh" in sys.argv else load_cached_fw(boot_id)
+    if fw is not None:
+        print("Found PN532 with firmware version:", fw, "(cached this boot)")
+        return 0
+
+    fw = read_fw()
+    save_cached_fw(boot_id, fw)
+    print("Found PN532 with firmware version:", fw)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
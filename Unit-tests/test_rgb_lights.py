@@ -29,6 +29,36 @@ COLORS = {
     6: ("Magenta", (True,  False, True)),
 }
 
+LIGHT_PINS = {1: LIGHT1_PINS, 2: LIGHT2_PINS}
+
+
+def _pin_mask(pins, rgb=(True, True, True)):
+    """Bit mask of the pins whose matching rgb entry is on"""
+    return sum(1 << pin for pin, is_on in zip(pins, rgb) if is_on)
+
+
+# light -> bits of the light, and (light, color) -> bits to set, built once
+LIGHT_MASKS = {light_num: _pin_mask(pins) for light_num, pins in LIGHT_PINS.items()}
+COLOR_MASKS = {
+    (light_num, color_num): _pin_mask(pins, rgb)
+    for light_num, pins in LIGHT_PINS.items()
+    for color_num, (_, rgb) in COLORS.items()
+}
+
+# Menu text never changes - rendered once at import
+_COLOR_MENU = (
+    "\n--- Color Options ---\n"
+    + "".join(f"  {num}. {name}\n" for num, (name, _) in COLORS.items())
+    + "  0. Turn OFF\n"
+    "  q. Quit\n"
+)
+_LIGHT_MENU = (
+    "\n=== Select Light ===\n"
+    "  1. Light 1 (P0-P2)\n"
+    "  2. Light 2 (P3-P5)\n"
+    "  q. Quit\n"
+)
+
 
 class RGBLightController:
     """Controller for two RGB LEDs on PCF8574"""
@@ -52,33 +82,36 @@ class RGBLightController:
             light_num: 1 or 2
             r, g, b: True = ON, False = OFF
         """
-        if light_num == 1:
-            pins = LIGHT1_PINS
-        elif light_num == 2:
-            pins = LIGHT2_PINS
-        else:
+        light_mask = LIGHT_MASKS.get(light_num)
+        if light_mask is None:
             raise ValueError("light_num must be 1 or 2")
         
         # LEDs are active-high: set bit to turn ON, clear bit to turn OFF
-        for pin, is_on in zip(pins, (r, g, b)):
-            if is_on:
-                self._state |= (1 << pin)   # Set bit (LED ON)
-            else:
-                self._state &= ~(1 << pin)  # Clear bit (LED OFF)
-        
-        self._write_state()
+        self._apply(_pin_mask(LIGHT_PINS[light_num], (r, g, b)), light_mask)
+    
+    def _apply(self, set_mask: int, light_mask: int):
+        """Replace a light's bits, writing only if the byte actually changes"""
+        new_state = (self._state & ~light_mask) | set_mask
+        if new_state != self._state:
+            self._state = new_state
+            self._write_state()
     
     def set_color(self, light_num: int, color_num: int):
         """Set a predefined color on a light"""
         if color_num not in COLORS:
             raise ValueError(f"Invalid color number: {color_num}")
         
-        _, (r, g, b) = COLORS[color_num]
-        self.set_light(light_num, r, g, b)
+        light_mask = LIGHT_MASKS.get(light_num)
+        if light_mask is None:
+            raise ValueError("light_num must be 1 or 2")
+        self._apply(COLOR_MASKS[light_num, color_num], light_mask)
     
     def turn_off(self, light_num: int):
         """Turn off a specific light"""
-        self.set_light(light_num, False, False, False)
+        light_mask = LIGHT_MASKS.get(light_num)
+        if light_mask is None:
+            raise ValueError("light_num must be 1 or 2")
+        self._apply(0, light_mask)
     
     def turn_off_all(self):
         """Turn off all lights"""
@@ -93,20 +126,15 @@ class RGBLightController:
 
 def print_menu():
     """Print the color selection menu"""
-    print("\n--- Color Options ---")
-    for num, (name, _) in COLORS.items():
-        print(f"  {num}. {name}")
-    print("  0. Turn OFF")
-    print("  q. Quit")
+    sys.stdout.write(_COLOR_MENU)
+    sys.stdout.flush()
 
 
 def select_light():
     """Prompt user to select a light"""
     while True:
-        print("\n=== Select Light ===")
-        print("  1. Light 1 (P0-P2)")
-        print("  2. Light 2 (P3-P5)")
-        print("  q. Quit")
+        sys.stdout.write(_LIGHT_MENU)
+        sys.stdout.flush()
         
         choice = input("\nEnter choice: ").strip().lower()
         
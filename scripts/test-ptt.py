@@ -10,6 +10,10 @@ Usage:
 
 import sys
 import os
+import io
+import select
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Add Main directory to path
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -18,6 +22,64 @@ main_dir = os.path.join(project_root, 'Main')
 sys.path.insert(0, main_dir)
 os.chdir(main_dir)
 
+# Ask PortAudio for its lowest capture latency (read when sounddevice loads)
+os.environ.setdefault('PA_MIN_LATENCY_MSEC', '10')
+
+# Imported once, up front (before the parallel tests start) - tests that
+# need it report the import error instead of each retrying the import
+try:
+    from hardware.voice_command import VoiceCommand
+    _vc_import_error = None
+except Exception as e:
+    VoiceCommand = None
+    _vc_import_error = e
+
+# The project's log lines are written by a background thread straight to the
+# real stdout (not the per-test buffers below) - flush them at each report
+# boundary so they never land inside a test's output
+from utils.logger import flush as flush_log
+
+
+class _ThreadOutput:
+    """stdout stand-in that sends a thread's prints to its own buffer (if set)"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        buf = getattr(self._local, 'buf', None)
+        return (buf if buf is not None else self._stream).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+    
+    def run_buffered(self, fn):
+        """Run fn with this thread's output buffered, return (result, output)"""
+        self._local.buf = io.StringIO()
+        try:
+            return fn(), self._local.buf.getvalue()
+        except Exception as e:
+            return False, self._local.buf.getvalue() + f"[FAIL] Unexpected error: {e}\n"
+        finally:
+            self._local.buf = None
+            flush_log()  # This test's log lines go out before its report
+
+
+_vc = None
+_vc_lock = threading.Lock()
+
+
+def get_vc():
+    """Shared VoiceCommand for all tests - constructed once (tests run in parallel)."""
+    global _vc
+    if VoiceCommand is None:
+        raise RuntimeError(f"Could not import hardware.voice_command: {_vc_import_error}")
+    with _vc_lock:
+        if _vc is None:
+            _vc = VoiceCommand()
+        return _vc
+
 
 def test_speech_recognition():
     """Test if SpeechRecognition library is installed."""
@@ -37,22 +99,16 @@ def test_internet():
     """Test internet connectivity (required for Google Speech API)."""
     print("\n=== Testing Internet Connectivity ===")
     
-    import subprocess
+    import socket
     try:
-        result = subprocess.run(
-            ['ping', '-c', '1', '-W', '3', '8.8.8.8'],
-            capture_output=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            print("[OK] Internet connection available")
-            return True
-        else:
-            print("[FAIL] No internet connection")
-            print("  Google Speech API requires internet")
-            return False
-    except Exception as e:
-        print(f"[FAIL] Connection test failed: {e}")
+        # TCP to a public DNS server: no ping process, and not blocked
+        # where ICMP is filtered (the Speech API is HTTPS over TCP anyway)
+        socket.create_connection(('8.8.8.8', 53), timeout=3).close()
+        print("[OK] Internet connection available")
+        return True
+    except OSError as e:
+        print(f"[FAIL] No internet connection ({e})")
+        print("  Google Speech API requires internet")
         return False
 
 
@@ -60,44 +116,65 @@ def test_microphone():
     """Test if microphone is working."""
     print("\n=== Testing Microphone ===")
     
-    import subprocess
-    import tempfile
-    
-    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as f:
-        temp_path = f.name
+    print("Recording 2 seconds of audio...")
     
+    # Capture in-process when PortAudio is available, no temp file needed
     try:
-        print("Recording 2 seconds of audio...")
-        result = subprocess.run(
-            ['arecord', '-f', 'S16_LE', '-r', '16000', '-c', '1', '-d', '2', '-q', temp_path],
-            capture_output=True,
-            timeout=10
-        )
+        import sounddevice as sd
+    except ImportError:
+        sd = None
+    
+    if sd is not None:
+        import numpy as np
         
-        if result.returncode != 0:
-            print(f"[FAIL] Recording failed: {result.stderr.decode()}")
+        buf = np.empty((2 * 16000, 1), dtype=np.int16)  # Preallocated, filled in place
+        try:
+            sd.rec(len(buf), samplerate=16000, channels=1, dtype='int16', out=buf,
+                   latency='low')
+            sd.wait()
+        except Exception as e:
+            print(f"[FAIL] Recording failed: {e}")
             return False
+        size = buf.nbytes
+        silent = not buf.any()
+    else:
+        import subprocess
         
-        size = os.path.getsize(temp_path)
-        print(f"[OK] Recording successful ({size} bytes)")
-        
-        if size < 1000:
-            print("[WARN] Recording seems very small - check microphone")
+        try:
+            # Raw PCM straight to stdout instead of a WAV file on disk
+            result = subprocess.run(
+                ['arecord', '-f', 'S16_LE', '-r', '16000', '-c', '1', '-d', '2',
+                 '--period-size=512', '--buffer-size=2048',
+                 '-t', 'raw', '-q', '-'],
+                capture_output=True,
+                text=False,  # stdout is PCM; stderr is decoded only on failure
+                timeout=10
+            )
+        except FileNotFoundError:
+            print("[FAIL] arecord not found - install alsa-utils")
+            return False
+        except subprocess.TimeoutExpired:
+            print("[FAIL] Recording timed out")
             return False
         
-        return True
+        if result.returncode != 0:
+            print(f"[FAIL] Recording failed: {result.stderr.decode('utf-8', 'replace')}")
+            return False
         
-    except FileNotFoundError:
-        print("[FAIL] arecord not found - install alsa-utils")
+        size = len(result.stdout)
+        silent = not result.stdout.strip(b'\x00')
+    
+    print(f"[OK] Recording successful ({size} bytes)")
+    
+    if size < 1000:
+        print("[WARN] Recording seems very small - check microphone")
         return False
-    except subprocess.TimeoutExpired:
-        print("[FAIL] Recording timed out")
+    
+    if silent:
+        print("[WARN] Recording is all zeros - check microphone / capture volume")
         return False
-    finally:
-        try:
-            os.unlink(temp_path)
-        except:
-            pass
+    
+    return True
 
 
 def test_voice_command_init():
@@ -105,9 +182,7 @@ def test_voice_command_init():
     print("\n=== Testing Voice Command Processor ===")
     
     try:
-        from hardware.voice_command import VoiceCommand
-        
-        vc = VoiceCommand()
+        vc = get_vc()
         print("[OK] VoiceCommand initialized")
         
         if vc.is_available():
@@ -123,27 +198,28 @@ def test_voice_command_init():
         return False
 
 
+# (transcript, expected command) pairs for test_parse_command
+PARSE_TEST_CASES = (
+    ("hi speaker play", "play"),
+    ("hi speaker pause", "pause"),
+    ("hi speaker stop", "stop"),
+    ("hi speaker clear", "clear"),
+    ("hi speaker play music", "play"),
+    ("play", None),
+    ("hello speaker play", None),
+    ("hi speaker volume up", None),
+    ("", None),
+)
+
+
 def test_parse_command():
     """Test command parsing logic."""
     print("\n=== Testing Command Parsing ===")
     
-    from hardware.voice_command import VoiceCommand
-    vc = VoiceCommand()
-    
-    test_cases = [
-        ("hi speaker play", "play"),
-        ("hi speaker pause", "pause"),
-        ("hi speaker stop", "stop"),
-        ("hi speaker clear", "clear"),
-        ("hi speaker play music", "play"),
-        ("play", None),
-        ("hello speaker play", None),
-        ("hi speaker volume up", None),
-        ("", None),
-    ]
+    vc = get_vc()
     
     all_passed = True
-    for text, expected in test_cases:
+    for text, expected in PARSE_TEST_CASES:
         result = vc._parse_command(text)
         status = "[OK]" if result == expected else "[FAIL]"
         if result != expected:
@@ -153,6 +229,19 @@ def test_parse_command():
     return all_passed
 
 
+def _prompt(message):
+    """input() replacement that waits in select() (Ctrl+C is handled at once).
+    
+    Returns the line without its newline, or None at end of input
+    (stdin closed / not interactive, e.g. in CI).
+    """
+    sys.stdout.write(message)
+    sys.stdout.flush()
+    select.select([sys.stdin], [], [])
+    line = sys.stdin.readline()
+    return line.rstrip('\n') if line else None
+
+
 def test_live_recognition():
     """Test live voice recognition with Google Speech API."""
     print("\n=== Testing Live Voice Recognition ===")
@@ -161,11 +250,11 @@ def test_live_recognition():
     print("Press Ctrl+C to skip this test.\n")
     
     try:
-        from hardware.voice_command import VoiceCommand
+        vc = get_vc()
         
-        vc = VoiceCommand()
-        
-        input("Press Enter when ready to speak...")
+        if _prompt("Press Enter when ready to speak...") is None:
+            print("\nNo input available - skipped live recognition test")
+            return True
         print("Listening for 3 seconds...")
         
         command = vc.listen_and_parse(duration=3.0)
@@ -186,36 +275,66 @@ def test_live_recognition():
         return False
 
 
+# Prerequisites per test - a test is reported as SKIP (not run) when one
+# of these did not pass. 'voice_module' is the hardware.voice_command import.
+TEST_DEPS = {
+    'voice_init': ('voice_module',),
+    'parse': ('voice_module',),
+    'live': ('speech_lib', 'internet', 'microphone', 'voice_init', 'parse'),
+}
+
+
+def _deps_passed(name, results):
+    return all(results.get(dep) is True for dep in TEST_DEPS.get(name, ()))
+
+
 def main():
+    flush_log()  # Import-time log lines before the header
     print("=" * 50)
     print("PTT Voice Command Test Suite")
     print("(Uses Google Speech API - requires internet)")
     print("=" * 50)
     
-    results = {}
+    if VoiceCommand is None:
+        print(f"\n[FAIL] Could not import hardware.voice_command: {_vc_import_error}")
+    prereqs = {'voice_module': VoiceCommand is not None}
     
-    # Run tests
-    results['speech_lib'] = test_speech_recognition()
-    results['internet'] = test_internet()
-    results['microphone'] = test_microphone()
-    results['voice_init'] = test_voice_command_init()
-    results['parse'] = test_parse_command()
+    # Run the independent tests concurrently (import, network, ALSA) -
+    # wall time is the slowest test, not the sum. Each test's output is
+    # buffered and printed in order so the report doesn't interleave.
+    tests = [
+        ('speech_lib', test_speech_recognition),
+        ('internet', test_internet),
+        ('microphone', test_microphone),
+        ('voice_init', test_voice_command_init),
+        ('parse', test_parse_command),
+    ]
+    results = {name: None for name, _ in tests}  # None = skipped
+    out = _ThreadOutput(sys.stdout)
+    sys.stdout = out
+    try:
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [(name, executor.submit(out.run_buffered, fn))
+                       for name, fn in tests if _deps_passed(name, prereqs)]
+            for name, future in futures:
+                results[name], output = future.result()
+                flush_log()
+                print(output, end='', flush=True)
+    finally:
+        sys.stdout = out._stream
     
     # Optional live test
-    if all(results.values()):
-        results['live'] = test_live_recognition()
-    
-    # Summary
-    print("\n" + "=" * 50)
-    print("Test Summary")
-    print("=" * 50)
-    
-    for test, passed in results.items():
-        status = "PASS" if passed else "FAIL"
-        print(f"  {test}: {status}")
+    flush_log()
+    results['live'] = test_live_recognition() if _deps_passed('live', results) else None
+    flush_log()
     
-    all_passed = all(results.values())
-    print("\n" + ("All tests passed!" if all_passed else "Some tests failed."))
+    # Summary - built up and written in one go
+    all_passed = all(passed is True for passed in results.values())
+    lines = ["", "=" * 50, "Test Summary", "=" * 50]
+    lines += [f"  {test}: {'SKIP' if passed is None else 'PASS' if passed else 'FAIL'}"
+              for test, passed in results.items()]
+    lines += ["", "All tests passed!" if all_passed else "Some tests failed."]
+    print("\n".join(lines))
     
     return 0 if all_passed else 1
 